@@ -1,7 +1,18 @@
 '''
 Init file
 '''
-from .data_generator import DataGenerator
-from .data_reader import DataReader
-
 __all__ = ['DataGenerator', 'DataReader']
+
+def __getattr__(name):
+    '''
+    Import objects on first use. DataReader pulls torch and scikit-learn, which
+    are not needed to generate data.
+    '''
+    # pylint: disable=import-outside-toplevel
+    if name == 'DataGenerator':
+        from .data_generator import DataGenerator
+        return DataGenerator
+    if name == 'DataReader':
+        from .data_reader import DataReader
+        return DataReader
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -2,13 +2,13 @@
 Generate RICH geometry and optical alignment input files for RICH
 Fast Monte Carlo simulations.
 '''
-from array import array
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import numpy as np
-import ROOT
 
-from ..file_handler import DataParser
+from ..file_handler import DataParser, TreeIO
+from .samplers import Sampler
 
 class DataGenerator():
     '''
@@ -74,80 +74,106 @@ class DataGenerator():
         else:
             print(f'ERROR: {file_type} template file is not provied!!!')
 
-    def create(self, output_dir: Path, num_of_points: int) -> None:
+    def create(self, output_dir: Path, num_of_points: int, sampling='uniform', seed=None, \
+workers=1, sidecar=None) -> None:
         '''
         Create data points
 
         Parameters:
             output_dir: Directory to create data
             num_of_points: Number of points to create
+            sampling: Design strategy "uniform", "lhs", "sobol" or "grid"
+            seed: Random seed of the sampler
+            workers: Number of processes to write geometry and optical files
+            sidecar: If "npz" or "csv" the tree is also saved without ROOT
         '''
         geo_dir = output_dir / 'geo'
         opt_dir = output_dir / 'opt'
         geo_dir.mkdir(exist_ok=True, parents=True)
         opt_dir.mkdir(exist_ok=True)
 
-        root_path = output_dir / 'data.root'
+        geo_columns = self.geo_keywords + [self.geo_correlation[key] for key in self.geo_keywords \
+if key in self.geo_correlation]
+        geo_values, opt_values = self._generate_events(num_of_points, sampling, seed)
+        num_of_points = len(geo_values)
 
-        root_file = ROOT.TFile.Open(str(root_path), 'RECREATE')
-        tree = ROOT.TTree('evtTree', 'Generated data tree')
+        jobs = []
+        if self.geo_temp_path:
+            geo_template = self.data_parser.compile_template(self.geo_temp_path, geo_columns)
+            jobs.append((geo_template, self._file_paths(geo_dir, num_of_points), geo_values))
+        if self.opt_temp_path:
+            opt_template = self.data_parser.compile_template(self.opt_temp_path, self.opt_keywords)
+            jobs.append((opt_template, self._file_paths(opt_dir, num_of_points), opt_values))
+        self._write_files(jobs, workers)
 
-        single_event = []
         keywords = self.geo_keywords + self.opt_keywords
-        for i, key in enumerate(keywords):
-            single_event.append(array('d',[0]))
-            tree.Branch(key, single_event[i], key+'/D')
-
-        for i in range(num_of_points):
-            geo_event, opt_event = self._generate_event()
-            if self.geo_temp_path:
-                self._create_file(geo_dir, geo_event, i)
-            if self.opt_temp_path:
-                self._create_file(opt_dir, opt_event, i)
-
-            for idx, keyword in enumerate(keywords):
-                value = geo_event[keyword] if keyword in geo_event else opt_event[keyword]
-                single_event[idx][0] = value
-            tree.Fill()
-        tree.Write()
-        root_file.Close()
-
-    def _generate_event(self) -> tuple:
+        values = np.hstack((geo_values[:, :len(self.geo_keywords)], opt_values))
+        columns = {key: values[:, i] for i, key in enumerate(keywords)}
+
+        tree_io = TreeIO('evtTree')
+        tree_io.write(output_dir / 'data.root', columns)
+        if sidecar:
+            tree_io.write_sidecar(output_dir / f'data.{sidecar}', columns)
+
+    def _generate_events(self, num_of_points: int, sampling: str, seed) -> tuple:
         '''
-        Single random event generator from keywords
+        Draw all events from keywords grids at once
+
+        Parameters:
+            num_of_points: Number of events
+            sampling: Design strategy "uniform", "lhs", "sobol" or "grid"
+            seed: Random seed of the sampler
 
         Return:
-            (geo_event, opt_event): Geometry event, Optical event
+            (geo_values, opt_values): (N, K_geo + K_corr) geometry values with correlated
+                keywords copied at the end, (N, K_opt) optical values
         '''
-        geo_event = {}
-        opt_event = {}
-        for i, keywords in enumerate([self.geo_keywords, self.opt_keywords]):
-            for keyword in keywords:
-                grid = self.input_dict[keyword]
-                value = np.random.uniform(grid[0], grid[1])
-                if i == 0:
-                    geo_event[keyword] = value
-                    if keyword in self.geo_correlation:
-                        geo_event[self.geo_correlation[keyword]] = value
-                else:
-                    opt_event[keyword] = value
-        return geo_event, opt_event
-
-    def _create_file(self, in_dir: Path, event: dict, idx: int) -> None:
+        keywords = self.geo_keywords + self.opt_keywords
+        sampler = Sampler([self.input_dict[key] for key in keywords], sampling, seed)
+        values = sampler.sample(num_of_points)
+
+        geo_values = values[:, :len(self.geo_keywords)]
+        corr_idx = [i for i, key in enumerate(self.geo_keywords) if key in self.geo_correlation]
+        geo_values = np.hstack((geo_values, geo_values[:, corr_idx]))
+        opt_values = values[:, len(self.geo_keywords):]
+        return geo_values, opt_values
+
+    @staticmethod
+    def _write_files(jobs: list, workers: int) -> None:
         '''
-        Save event into file
+        Render files from compiled templates. With more than one worker point
+        indices are split into shards and each process writes its own files.
 
         Parameters:
-            in_dir: Path to the directory
-            event: Generated event
-            idx: ID of the event
+            jobs: List of (template, file paths, values) to render
+            workers: Number of processes
         '''
-        file_path, temp_path = None, None
-        if in_dir.name =='geo':
-            file_path = in_dir / f'{self.geo_temp_path.stem}_{idx}{self.geo_temp_path.suffix}'
-            temp_path = self.geo_temp_path
-        else:
-            file_path = in_dir / f'{self.opt_temp_path.stem}_{idx}{self.opt_temp_path.suffix}'
-            temp_path = self.opt_temp_path
+        if workers <= 1:
+            for template, paths, values in jobs:
+                template.write_many(paths, values)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = []
+            for template, paths, values in jobs:
+                for shard in np.array_split(np.arange(len(paths)), workers):
+                    if len(shard) == 0:
+                        continue
+                    shard_paths = [paths[idx] for idx in shard]
+                    futures.append(executor.submit(template.write_many, shard_paths, values[shard]))
+            for future in futures:
+                future.result()
+
+    def _file_paths(self, in_dir: Path, num_of_points: int) -> list:
+        '''
+        Output file paths of the events
+
+        Parameters:
+            in_dir: Path to the directory
+            num_of_points: Number of events
 
-        self.data_parser.create_file(file_path, temp_path, event)
+        Return:
+            List of the file paths
+        '''
+        temp_path = self.geo_temp_path if in_dir.name == 'geo' else self.opt_temp_path
+        return [in_dir / f'{temp_path.stem}_{idx}{temp_path.suffix}' for idx in range(num_of_points)]
@@ -2,7 +2,6 @@
 Data Reader
 '''
 from pathlib import Path
-from sklearn.model_selection import train_test_split
 import torch
 from torch.utils.data import DataLoader
 
@@ -71,14 +70,16 @@ if values["exists"]]
         self.neg_dataset_reader, self.pos_dataset_reader = None, None
         neg_part_dataset_path = Path(dataset_info['neg_part_dataset_path'])
         pos_part_dataset_path = Path(dataset_info['pos_part_dataset_path'])
+        cache = dataset_info.get('cache', False)
+        io_workers = dataset_info.get('io_workers', 1)
 
         if dataset_info['charge'] == 'mixed':
-            self.neg_dataset_reader = DatasetReader(neg_part_dataset_path, neg_file_names)
-            self.pos_dataset_reader = DatasetReader(pos_part_dataset_path, pos_file_names)
+            self.neg_dataset_reader = DatasetReader(neg_part_dataset_path, neg_file_names, cache, io_workers)
+            self.pos_dataset_reader = DatasetReader(pos_part_dataset_path, pos_file_names, cache, io_workers)
         elif dataset_info['charge'] == 'positive':
-            self.pos_dataset_reader = DatasetReader(pos_part_dataset_path, pos_file_names)
+            self.pos_dataset_reader = DatasetReader(pos_part_dataset_path, pos_file_names, cache, io_workers)
         elif dataset_info['charge'] == 'negative':
-            self.neg_dataset_reader = DatasetReader(neg_part_dataset_path, neg_file_names)
+            self.neg_dataset_reader = DatasetReader(neg_part_dataset_path, neg_file_names, cache, io_workers)
 #            print('ERROR: charge should be one of this ["mixed", "positive", "negative"]!')
 
         iterable_folder = dataset_info['neg_part_dataset_path']
@@ -87,22 +88,26 @@ if values["exists"]]
 
         self.dataset_folder_names = []
         for folder_path in Path(iterable_folder).iterdir():
-            if folder_path.is_file():
+            if folder_path.is_file() or folder_path.name.startswith('.'):
                 continue
             self.dataset_folder_names.append(folder_path.name)
 
 
-    def get_data(self, batch_size=16, val_size=0.2, norm=True)->tuple:
+    def get_data(self, batch_size=16, val_size=0.2, norm=True, shuffle=True)->tuple:
         '''
         Read data from files, preprocess and return torch.tensors
 
         Parameters:
+            batch_size: Training batch size
             val_size: Validation set ratio should be float in the range (0,1)
+            shuffle: Shuffle data before split
         '''
+        from sklearn.model_selection import train_test_split # pylint: disable=import-outside-toplevel
+
         device = 'cpu'#'cuda' if torch.cuda.is_available() else 'cpu'
 
         x, y = self._preprocess_set(self.dataset_folder_names)
-        x_train, x_val, y_train, y_val = train_test_split(x,y, test_size=val_size)
+        x_train, x_val, y_train, y_val = train_test_split(x,y, test_size=val_size, shuffle=shuffle)
 
         x_train, x_val = x_train.to(device), x_val.to(device)
         y_train, y_val = y_train.to(device), y_val.to(device)
@@ -132,6 +137,21 @@ if values["exists"]]
         if self.neg_dataset_reader:
             neg_x, neg_y = self.neg_dataset_reader.read_dataset(dataset, self.keywords)
 
+        failed = set()
+        for reader in (self.pos_dataset_reader, self.neg_dataset_reader):
+            if reader:
+                failed.update(reader.failed_folders)
+        if failed:
+            print(f'WARNING: {len(failed)} data points are skipped as they cannot be read!')
+            kept = [folder for folder in dataset if folder not in failed]
+            if self.pos_dataset_reader:
+                pos_x, pos_y = self._select_rows(pos_x, pos_y, dataset, \
+self.pos_dataset_reader.failed_folders, kept)
+            if self.neg_dataset_reader:
+                neg_x, neg_y = self._select_rows(neg_x, neg_y, dataset, \
+self.neg_dataset_reader.failed_folders, kept)
+            dataset = kept
+
         if neg_x is None:
             return pos_x, pos_y
         if pos_x is None:
@@ -150,3 +170,24 @@ if values["exists"]]
             x = torch.hstack((x,c))
             y = torch.vstack((neg_y, pos_y))
         return x, y
+
+    @staticmethod
+    def _select_rows(x, y, dataset: list, failed_folders: list, kept: list) -> tuple:
+        '''
+        Select rows of the kept folders from the read dataset
+
+        Parameters:
+            x: Features read without failed folders
+            y: Targets read without failed folders
+            dataset: List of the requested data points folders
+            failed_folders: Folders that reader failed to read
+            kept: Folders to keep
+
+        Return:
+            (x, y): Selected features and targets
+        '''
+        failed_folders = set(failed_folders)
+        read_folders = [folder for folder in dataset if folder not in failed_folders]
+        row_ids = {folder: i for i, folder in enumerate(read_folders)}
+        idx = torch.tensor([row_ids[folder] for folder in kept], dtype=torch.long)
+        return x[idx], y[idx]
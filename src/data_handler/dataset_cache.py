@@ -0,0 +1,119 @@
+'''
+Columnar dataset cache
+'''
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+class DatasetCache():
+    '''
+    Keep parsed dataset matrices as memory-mapped .npy files next to the dataset
+    '''
+    def __init__(self, dataset_path: Path, file_names: dict, cache_dir_name='.cache') -> None:
+        '''
+        Init method
+
+        Parameters:
+            dataset_path: Dataset directory path
+            file_names: Names of the files from input metadata
+            cache_dir_name: Name of the cache directory inside dataset directory
+        '''
+        self.dataset_path = dataset_path
+        self.file_names = file_names
+        self.cache_dir = dataset_path / cache_dir_name
+
+    def key(self, folder_names: list, keywords: dict) -> str:
+        '''
+        Create cache key from keywords, file names and each used file mtime and size
+
+        Parameters:
+            folder_names: List of the data point folder names
+            keywords: Keywords used to make dataset
+
+        Return:
+            Hex digest of the cache key
+        '''
+        files_info = []
+        for folder in folder_names:
+            for path in self._used_files(folder, keywords):
+                try:
+                    stat = path.stat()
+                    files_info.append([folder, path.name, stat.st_mtime_ns, stat.st_size])
+                except FileNotFoundError:
+                    files_info.append([folder, path.name, -1, -1])
+
+        payload = {
+            'keywords': keywords,
+            'file_names': self.file_names,
+            'files': files_info
+        }
+        payload = json.dumps(payload, sort_keys=True)
+        return hashlib.sha1(payload.encode('utf8')).hexdigest()
+
+    def load(self, key: str) -> tuple:
+        '''
+        Load cached matrices
+
+        Parameters:
+            key: Cache key
+
+        Return:
+            (x, y): Memory-mapped features and targets or (None, None) if not cached
+        '''
+        x_path, y_path = self._paths(key)
+        if not x_path.exists() or not y_path.exists():
+            return None, None
+        x = np.load(x_path, mmap_mode='c')
+        y = np.load(y_path, mmap_mode='c')
+        return x, y
+
+    def save(self, key: str, x: np.ndarray, y: np.ndarray) -> None:
+        '''
+        Save matrices into the cache
+
+        Parameters:
+            key: Cache key
+            x: Features matrix
+            y: Targets matrix
+        '''
+        self.cache_dir.mkdir(exist_ok=True, parents=True)
+        for path, data in zip(self._paths(key), (x, y)):
+            tmp_path = path.with_name(path.name + '.tmp')
+            with open(tmp_path, 'wb') as file_writer:
+                np.save(file_writer, data)
+            os.replace(tmp_path, path)
+
+    def _paths(self, key: str) -> tuple:
+        '''
+        Cache files paths for the key
+
+        Parameters:
+            key: Cache key
+
+        Return:
+            (x_path, y_path): Features and targets .npy paths
+        '''
+        return self.cache_dir / f'{key}_x.npy', self.cache_dir / f'{key}_y.npy'
+
+    def _used_files(self, folder: str, keywords: dict) -> list:
+        '''
+        Files that are parsed for the data point folder
+
+        Parameters:
+            folder: Data point folder name
+            keywords: Keywords used to make dataset
+
+        Return:
+            paths: List of the file paths
+        '''
+        paths = []
+        for file_type in ('geo', 'opt', 'aer', 'pmt', 'trk'):
+            if len(keywords[file_type]) != 0:
+                paths.append(self.dataset_path / folder / self.file_names[file_type])
+        if len(keywords['top']) != 0:
+            for file_name in self.file_names['top']:
+                paths.append(self.dataset_path / folder / file_name)
+        return paths
@@ -1,31 +1,43 @@
 '''
 Dataset Loader
 '''
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import torch
 from ..file_handler import DataParser
+from .dataset_cache import DatasetCache
 
 class DatasetReader():
     '''
     Dataset Loader object
     '''
-    def __init__(self, dataset_path: Path, file_names: dict) -> None:
+    def __init__(self, dataset_path: Path, file_names: dict, cache=False, io_workers=1) -> None:
         '''
         Init method
 
         Parameters:
             dataset_path: Dataset directory path
             file_names: Names of the files from input metadata
+            cache: Keep parsed dataset as .npy files next to the dataset
+            io_workers: Number of threads to read data point folders
         '''
         self.data_parser = DataParser()
 
         self.dataset_path = dataset_path
         self.file_names = file_names
         self.device='cpu'
+        self.io_workers = io_workers
+        self.failed_folders = []
+
+        self.cache = None
+        if cache:
+            self.cache = DatasetCache(dataset_path, file_names)
 
     def read_dataset(self, folder_names: list, keywords: dict) -> tuple:
         '''
-        With keywords get next batch from folder_names
+        With keywords get next batch from folder_names. Folders that cannot be
+        read are skipped and saved in failed_folders. Raises FileNotFoundError
+        if none of the folders can be read.
 
         Parameters:
             folder_names: List of the folder names to make torch tensors
@@ -34,59 +46,109 @@ class DatasetReader():
         Return:
             (dataset_x, dataset_y): (features, targets)
         '''
+        self.failed_folders = []
+        cache_key = None
+        if self.cache:
+            cache_key = self.cache.key(folder_names, keywords)
+            dataset_x, dataset_y = self.cache.load(cache_key)
+            if dataset_x is not None:
+                return torch.from_numpy(dataset_x).to(self.device), \
+torch.from_numpy(dataset_y).to(self.device)
+
+        def read_folder(folder):
+            try:
+                return self._folder_to_data(folder, keywords), None
+            except Exception as error: # pylint: disable=broad-except
+                return None, error
+
+        if self.io_workers > 1:
+            with ThreadPoolExecutor(max_workers=self.io_workers) as executor:
+                results = list(executor.map(read_folder, folder_names))
+        else:
+            results = [read_folder(folder) for folder in folder_names]
+
         dataset_x = []
         dataset_y = []
-        for folder in folder_names:
-            geo_data_path = self.dataset_path / folder / self.file_names['geo']
-            geo_data = []
-            if len(keywords['geo']) != 0:
-                geo_data = self._file_to_data(geo_data_path, keywords['geo'])
-
-            opt_data_path = self.dataset_path / folder / self.file_names['opt']
-            opt_data = []
-            if len(keywords['opt']) != 0:
-                opt_data = self._file_to_data(opt_data_path, keywords['opt'])
-
-            aer_data_path = self.dataset_path / folder / self.file_names['aer']
-            aer_data = []
-            if len(keywords['aer']) != 0:
-                aer_data = self._file_to_data(aer_data_path, keywords['aer'])
-
-            top_data_dir = self.dataset_path / folder
-            top_data = []
-            if len(keywords['top']) != 0:
-                top_data = self._top_to_data(top_data_dir, self.file_names['top'], keywords['top'])
-
-            pmt_data_path = self.dataset_path / folder / self.file_names['pmt']
-            pmt_data = [] 
-            if len(keywords['pmt']) != 0:
-                pmt_data = self._file_to_data(pmt_data_path, keywords['pmt'])
-
-            trk_data_path = self.dataset_path / folder / self.file_names['trk']
-            trk_data = []
-            if len(keywords['trk']) != 0:
-                trk_data = self._file_to_data(trk_data_path, keywords['trk'])
-
-        
-            dataset_x.append(geo_data + opt_data)
-            dataset_y.append(aer_data + top_data + pmt_data + trk_data)
+        for folder, (data, error) in zip(folder_names, results):
+            if error is not None:
+                print(f'ERROR: {self.dataset_path / folder} cannot be read! {error!r}')
+                self.failed_folders.append(folder)
+                continue
+            dataset_x.append(data[0])
+            dataset_y.append(data[1])
+
+        if folder_names and not dataset_x:
+            raise FileNotFoundError(f'None of the {len(folder_names)} data points in \
+{self.dataset_path} can be read! Check dataset path and file names.')
 
         dataset_x = torch.tensor(dataset_x, dtype=torch.float, device=self.device)
         dataset_y = torch.tensor(dataset_y, dtype=torch.float, device=self.device)
 
+        if self.cache and not self.failed_folders:
+            self.cache.save(cache_key, dataset_x.numpy(), dataset_y.numpy())
+
         return dataset_x, dataset_y
 
+    def _folder_to_data(self, folder: str, keywords: dict) -> tuple:
+        '''
+        Read single data point folder
+
+        Parameters:
+            folder: Data point folder name
+            keywords: keywords to use to make dataset
+
+        Return:
+            (x, y): Features and targets lists of the data point
+        '''
+        geo_data_path = self.dataset_path / folder / self.file_names['geo']
+        geo_data = []
+        if len(keywords['geo']) != 0:
+            geo_data = self._file_to_data(geo_data_path, keywords['geo'])
+
+        opt_data_path = self.dataset_path / folder / self.file_names['opt']
+        opt_data = []
+        if len(keywords['opt']) != 0:
+            opt_data = self._file_to_data(opt_data_path, keywords['opt'])
+
+        aer_data_path = self.dataset_path / folder / self.file_names['aer']
+        aer_data = []
+        if len(keywords['aer']) != 0:
+            aer_data = self._file_to_data(aer_data_path, keywords['aer'])
+
+        top_data_dir = self.dataset_path / folder
+        top_data = []
+        if len(keywords['top']) != 0:
+            top_data = self._top_to_data(top_data_dir, self.file_names['top'], keywords['top'])
+
+        pmt_data_path = self.dataset_path / folder / self.file_names['pmt']
+        pmt_data = []
+        if len(keywords['pmt']) != 0:
+            pmt_data = self._file_to_data(pmt_data_path, keywords['pmt'])
+
+        trk_data_path = self.dataset_path / folder / self.file_names['trk']
+        trk_data = []
+        if len(keywords['trk']) != 0:
+            trk_data = self._file_to_data(trk_data_path, keywords['trk'])
+
+        return geo_data + opt_data, aer_data + top_data + pmt_data + trk_data
+
     def _file_to_data(self, path, keywords):
-        raw_data = self.data_parser.read_file(path)
+        raw_data = self.data_parser.read_file(path, keywords)
         data = [raw_data[keyword] for keyword in keywords]
         return data
 
     def _top_to_data(self, folder_path, file_names, keywords):
+        top_keywords = {}
+        for keyword in keywords:
+            top_keywords.setdefault(keyword.split('_')[0], []).append(keyword)
+
         top_data_dict = {}
         for file_name in file_names:
             top_key = file_name.split('.')[2].split('_')[-1]
+            if top_key not in top_keywords:
+                continue
             file_path = folder_path / file_name
-            top_data_dict[top_key] = self.data_parser.read_file(file_path)
+            top_data_dict[top_key] = self.data_parser.read_file(file_path, top_keywords[top_key])
         data = []
         for keyword in keywords:
             top_key = keyword.split('_')[0]
@@ -0,0 +1,92 @@
+'''
+Samplers to draw the whole design of the generated data points at once
+'''
+import numpy as np
+
+class Sampler():
+    '''
+    Draw (N, K) design in the keywords grid box
+    '''
+    strategies = ('uniform', 'lhs', 'sobol', 'grid')
+    max_grid_points = 10**6
+
+    def __init__(self, grids: list, strategy='uniform', seed=None) -> None:
+        '''
+        Init method
+
+        Parameters:
+            grids: [MIN_VAL, MAX_VAL, POINT_NUM] for each keyword
+            strategy: One of "uniform", "lhs", "sobol" or "grid"
+            seed: Random seed
+        '''
+        if strategy not in self.strategies:
+            raise ValueError(f'Sampling strategy should be one of {self.strategies}!')
+        self.strategy = strategy
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+
+        grids = np.array(grids, dtype=float).reshape((len(grids), 3))
+        self.lows = grids[:, 0]
+        self.highs = grids[:, 1]
+        self.points = grids[:, 2].astype(int)
+
+    def sample(self, num_of_points: int) -> np.ndarray:
+        '''
+        Draw design
+
+        Parameters:
+            num_of_points: Number of points to draw. Ignored by "grid" strategy
+                which returns all grid nodes
+
+        Return:
+            values: (N, K) design
+        '''
+        if self.strategy == 'grid':
+            return self._grid()
+
+        dim = len(self.lows)
+        if self.strategy == 'uniform':
+            unit = self.rng.random((num_of_points, dim))
+        elif self.strategy == 'lhs':
+            unit = self._lhs(num_of_points, dim)
+        else:
+            unit = self._sobol(num_of_points, dim)
+        return self.lows + unit*(self.highs - self.lows)
+
+    def _lhs(self, num_of_points: int, dim: int) -> np.ndarray:
+        '''
+        Latin hypercube design in unit cube. Each axis is split into N strata
+        and every stratum is used once.
+        '''
+        strata = np.tile(np.arange(num_of_points), (dim, 1))
+        strata = self.rng.permuted(strata, axis=1).T
+        return (strata + self.rng.random((num_of_points, dim)))/num_of_points
+
+    def _sobol(self, num_of_points: int, dim: int) -> np.ndarray:
+        '''
+        Scrambled Sobol sequence in unit cube
+        '''
+        if dim == 0:
+            return np.zeros((num_of_points, 0))
+        import torch # pylint: disable=import-outside-toplevel
+        seed = int(self.rng.integers(2**31))
+        engine = torch.quasirandom.SobolEngine(dim, scramble=True, seed=seed)
+        return engine.draw(num_of_points, dtype=torch.float64).numpy()
+
+    def _grid(self) -> np.ndarray:
+        '''
+        All nodes of the keywords grids. The number of nodes is checked before
+        the grid is built.
+        '''
+        total = 1
+        for points in self.points.tolist():
+            total *= points
+        if total > self.max_grid_points:
+            raise ValueError(f'Grid sampling needs {total} points ({" x ".join(map(str, self.points.tolist()))}), \
+more than {self.max_grid_points}! Reduce grid points or use "uniform", "lhs" or "sobol" sampling.')
+        axes = [np.linspace(low, high, points) for low, high, points in \
+zip(self.lows, self.highs, self.points)]
+        if len(axes) == 0:
+            return np.zeros((1, 0))
+        mesh = np.meshgrid(*axes, indexing='ij')
+        return np.stack([axis.ravel() for axis in mesh], axis=1)
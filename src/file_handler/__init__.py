@@ -2,5 +2,6 @@
 Init file
 '''
 from .data_parser import DataParser
+from .tree_io import TreeIO
 
-__all__ = ['DataParser']
+__all__ = ['DataParser', 'TreeIO']
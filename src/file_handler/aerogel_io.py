@@ -19,18 +19,34 @@ class AerogelIO(FileIO):
         self.params = AERO_FILE_PARAMS
         self.lines = AERO_FILE_AEROGEL_LINES
 
-    def read_file(self, input_path: Path) -> dict:
+    def read_file(self, input_path: Path, keywords=None) -> dict:
         '''
         Read from the txt file and convert it to dict
 
         Parameters:
             input_path: Path to the aerogel parameters file
+            keywords: If provided only these keywords are parsed
 
         Return:
             file_data: Preprocessed data from text file
         '''
         file_raw_data = self.read_input_file(input_path)
         file_data = {}
+        if keywords is not None:
+            lookup = self._get_lookup(keywords)
+            for line in file_raw_data:
+                line_key = line.split(None, 2)[:2]
+                if len(line_key) < 2:
+                    continue
+                line_key = (int(line_key[0]), int(line_key[1]))
+                if line_key not in lookup:
+                    continue
+                line_struc = self._clean_line(line)
+                for j, keyword in lookup[line_key]:
+                    file_data[keyword] = float(line_struc[j])
+            self._check_keywords(file_data, keywords, input_path)
+            return file_data
+
         for line in file_raw_data:
             line_struc = self._clean_line(line)
             lid = int(line_struc[1])
@@ -39,6 +55,23 @@ class AerogelIO(FileIO):
                 file_data[f'{self.lines[lid]}_{self.position[pid]}_{self.params[j]}'] = float(value)
         return file_data
 
+    def _compile_keywords(self, keywords: tuple) -> dict:
+        '''
+        Resolve keywords to the (topology id, layer id) lines and columns
+
+        Parameters:
+            keywords: Keywords to parse
+
+        Return:
+            lookup: (topology id, layer id) to list of (column, keyword) pairs
+        '''
+        positions = {}
+        for lid, line_name in self.lines.items():
+            for pid, position in self.position.items():
+                for j, param in self.params.items():
+                    positions[f'{line_name}_{position}_{param}'] = ((pid, lid), j + 2)
+        return self._positions_to_lookup(positions, keywords)
+
     def create_file(self, output_path: Path, temp_path: Path, evt_data: dict) -> None:
         raise NotImplementedError('Aerogel file creation method not implemented \
 as it should be generated from simulations!')
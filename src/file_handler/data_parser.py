@@ -3,6 +3,7 @@ Main file to read and write data files
 '''
 from pathlib import Path
 
+from .file_io import FileIO
 from .geometry_io import GeometryIO
 from .optical_io import OpticalIO
 from .aerogel_io import AerogelIO
@@ -10,6 +11,7 @@ from .topology_io import TopologyIO
 from .mapmt_io import MapmtIO
 from .variation_io import VariationIO
 from .tracks_io import TracksIO
+from .template import CompiledTemplate
 
 from .reader_structs import TOP_FILE_NAMES
 
@@ -33,28 +35,39 @@ class DataParser:
         Return:
             None
         '''
+        self.strategy = self._get_strategy(file_path)
+
+    @staticmethod
+    def _get_strategy(file_path: Path) -> FileIO:
+        '''
+        Create strategy for file reading from file name
+
+        Parameters:
+            file_path: Path to the input file
+
+        Return:
+            strategy: File handler for the file
+        '''
         file_name = file_path.name
         file_suffix = file_path.suffix
         if 'Geometry' in file_name and file_suffix == '.dat':
-            self.strategy = GeometryIO()
+            return GeometryIO()
         elif 'Variation' in  file_name and file_suffix == '.dat':
-            self.strategy = VariationIO()
+            return VariationIO()
         elif 'Optical' in file_name and file_suffix == '.dat':
-            self.strategy = OpticalIO()
+            return OpticalIO()
         elif 'Aerogel' in file_name and file_suffix == '.out':
-            self.strategy = AerogelIO()
+            return AerogelIO()
         elif 'MAPMT' in file_name and file_suffix == '.out':
-            self.strategy = MapmtIO()
+            return MapmtIO()
         elif 'Tracks' in file_name and file_suffix == '.out':
-            self.strategy = TracksIO()
+            return TracksIO()
         elif file_suffix == '.out':
             for name in TOP_FILE_NAMES:
                 if name in file_name:
-                    self.strategy = TopologyIO(name)
-                    break
-        else:
-            err_str = '"'+'","'.join(TOP_FILE_NAMES)+'"'
-            raise TypeError(f'File cannot be handeled!!! Check for possible solutions.\n \
+                    return TopologyIO(name)
+        err_str = '"'+'","'.join(TOP_FILE_NAMES)+'"'
+        raise TypeError(f'File cannot be handeled!!! Check for possible solutions.\n \
 1. Geometry data file name should contain "Geometry" word and have ".dat" extension\n \
 2. Optical data file name should contain "Optical" word and have ".dat" extension\n \
 3. Variation data file name should contain "Variation" word and have ".dat" extension\n \
@@ -63,18 +76,20 @@ class DataParser:
 6. Tracks output file should contain "Tracks" word and have ".out" extension\n \
 7. Any topology file name should contain {err_str} word and have ".out" extension\n')
 
-    def read_file(self, file_path: Path) -> dict:
+    def read_file(self, file_path: Path, keywords=None) -> dict:
         '''
         Use the file name to define strategy and convert file to the dictinory
 
         Parameters:
             file_path: Path to the input file
+            keywords: If provided only these keywords are parsed
 
         Return:
             data_dict: Converted data dictinory
         '''
-        self._set_strategy(file_path)
-        data_dict = self.strategy.read_file(file_path)
+        # Local strategy, the parser is shared between reading threads
+        strategy = self._get_strategy(file_path)
+        data_dict = strategy.read_file(file_path, keywords)
         return data_dict
 
     def create_file(self, output_path: Path, temp_path: Path, evt_dict: dict) -> None:
@@ -92,3 +107,18 @@ class DataParser:
         '''
         self._set_strategy(temp_path)
         self.strategy.create_file(output_path, temp_path, evt_dict)
+
+    def compile_template(self, temp_path: Path, keywords: list) -> CompiledTemplate:
+        '''
+        Parse template file once with the defined strategy. The returned object
+        renders many files from (N, K) values array.
+
+        Parameters:
+            temp_path: Template file path
+            keywords: Keywords to change in the new files, K
+
+        Return:
+            CompiledTemplate object
+        '''
+        strategy = self._get_strategy(temp_path)
+        return strategy.compile_template(temp_path, keywords)
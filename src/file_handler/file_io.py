@@ -8,24 +8,94 @@ class FileIO(ABC):
     '''
     Abstract class
     '''
+    _lookups = {}
+
     def __init__(self, name=None):
         '''
         Init method
         '''
         self.name = name
 
-    def read_file(self, input_path: Path) -> dict:
+    def read_file(self, input_path: Path, keywords=None) -> dict:
         '''
         Read file and parse it to the dict
 
         Parameters:
             input_path: Path to the input file
+            keywords: If provided only these keywords are parsed
 
         Return:
             Parsed dictinory
         '''
         raise NotImplementedError()
 
+    def _compile_keywords(self, keywords: tuple) -> dict:
+        '''
+        Resolve keywords to the lines and columns of the file
+
+        Parameters:
+            keywords: Keywords to parse
+
+        Return:
+            lookup: Line key to list of (column, keyword) pairs
+        '''
+        raise NotImplementedError()
+
+    def _get_lookup(self, keywords: list) -> dict:
+        '''
+        Compiled keywords lookup. Lookups are compiled once per file type and
+        keywords set.
+
+        Parameters:
+            keywords: Keywords to parse
+
+        Return:
+            lookup: Line key to list of (column, keyword) pairs
+        '''
+        keywords = tuple(keywords)
+        lookup_key = (type(self).__name__, self.name, keywords)
+        lookup = FileIO._lookups.get(lookup_key)
+        if lookup is None:
+            lookup = self._compile_keywords(keywords)
+            FileIO._lookups[lookup_key] = lookup
+        return lookup
+
+    @staticmethod
+    def _positions_to_lookup(positions: dict, keywords: tuple) -> dict:
+        '''
+        Group keyword positions by line
+
+        Parameters:
+            positions: Keyword to (line key, column) dict of all possible keywords
+            keywords: Keywords to parse
+
+        Return:
+            lookup: Line key to list of (column, keyword) pairs
+        '''
+        lookup = {}
+        for keyword in keywords:
+            if keyword not in positions:
+                raise KeyError(keyword)
+            line_key, column = positions[keyword]
+            lookup.setdefault(line_key, []).append((column, keyword))
+        return lookup
+
+    @staticmethod
+    def _check_keywords(file_data: dict, keywords: list, input_path: Path) -> None:
+        '''
+        Check that all requested keywords were found in the file
+
+        Parameters:
+            file_data: Parsed data
+            keywords: Requested keywords
+            input_path: Path to the input file
+        '''
+        if len(file_data) == len(keywords):
+            return
+        for keyword in keywords:
+            if keyword not in file_data:
+                raise KeyError(f'{keyword} is not found in {input_path}')
+
     @staticmethod
     def read_input_file(input_file_path: str) -> list:
         '''
@@ -55,6 +125,19 @@ class FileIO(ABC):
         '''
         raise NotImplementedError()
 
+    def compile_template(self, temp_path: Path, keywords: list):
+        '''
+        Parse template file once and resolve keywords to fixed slots
+
+        Parameters:
+            temp_path: Template file path
+            keywords: Keywords to change in the new files
+
+        Return:
+            CompiledTemplate object
+        '''
+        raise NotImplementedError()
+
     @staticmethod
     def _clean_line(line: str) -> list:
         '''
@@ -5,6 +5,7 @@ Geometry file IO
 from pathlib import Path
 
 from .file_io import FileIO
+from .template import CompiledTemplate
 from .reader_structs import (GEO_FILE_LINES, GEO_FILE_EUCLIDE_PARAMS,
  GEO_FILE_ANGLE_PARAMS)
 
@@ -21,18 +22,30 @@ class GeometryIO(FileIO):
         self.angle_params = GEO_FILE_ANGLE_PARAMS
         self.lines = GEO_FILE_LINES
 
-    def read_file(self, input_path: Path) -> dict:
+    def read_file(self, input_path: Path, keywords=None) -> dict:
         '''
         Read data from the simulation output file
 
         Parameterss:
             file_path: Path to the geometry parameters file
+            keywords: If provided only these keywords are parsed
 
         Return:
             file_data: Preprocessed data from text file
         '''
         file_raw_data = self.read_input_file(input_path)
         file_data = {}
+        if keywords is not None:
+            lookup = self._get_lookup(keywords)
+            for i, line in enumerate(file_raw_data):
+                if i not in lookup:
+                    continue
+                line_struc = self._clean_line(line)
+                for j, keyword in lookup[i]:
+                    file_data[keyword] = float(line_struc[j])
+            self._check_keywords(file_data, keywords, input_path)
+            return file_data
+
         for i, line in enumerate(file_raw_data):
             if i % 3 == 0:
                 continue
@@ -43,6 +56,23 @@ class GeometryIO(FileIO):
                 file_data[f'{self.lines[lid]}_{params[j]}'] = float(value)
         return file_data
 
+    def _compile_keywords(self, keywords: tuple) -> dict:
+        '''
+        Resolve keywords to the lines and columns of the geometry file
+
+        Parameters:
+            keywords: Keywords to parse
+
+        Return:
+            lookup: Line number to list of (column, keyword) pairs
+        '''
+        positions = {}
+        for lid, line_name in GEO_FILE_LINES.items():
+            for shift, params in ((1, GEO_FILE_EUCLIDE_PARAMS), (2, GEO_FILE_ANGLE_PARAMS)):
+                for j, param in params.items():
+                    positions[f'{line_name}_{param}'] = (lid*3 + shift, j)
+        return self._positions_to_lookup(positions, keywords)
+
     def create_file(self, output_path: Path, temp_path: Path, evt_data: dict) -> None:
         '''
         Read geometry template file eand create similar geometry file with new parameters
@@ -55,18 +85,29 @@ class GeometryIO(FileIO):
         Return:
             None
         '''
+        template = self.compile_template(temp_path, list(evt_data.keys()))
+        template.write(output_path, list(evt_data.values()))
+
+    def compile_template(self, temp_path: Path, keywords: list) -> CompiledTemplate:
+        '''
+        Parse geometry template file once and resolve keywords to fixed slots
+
+        Parameters:
+            temp_path: Template file path
+            keywords: Keywords to change in generated geometry files
+
+        Return:
+            template: Compiled geometry template
+        '''
         temp_data = self.read_input_file(temp_path)
-        self.lines = {v:k for k,v in self.lines.items()}
-        self.geo_params = {v:k for k,v in self.geo_params.items()}
-        for key,value in evt_data.items():
+        self.lines = {v:k for k,v in GEO_FILE_LINES.items()}
+        self.geo_params = {v:k for k,v in GEO_FILE_EUCLIDE_PARAMS.items()}
+        positions, formats = [], []
+        for key in keywords:
             line_num, param_num = self._kw_to_pos(key)
-            line = temp_data[line_num]
-            line = self._clean_line(line)
-            value = f'{value:.3}' if  line_num%3==2 else f'{value:.4}'
-            line[param_num] = value
-            temp_data[line_num] = ' '.join(line) + '\n'
-        with open(output_path, 'w', encoding="utf8") as file_writer:
-            file_writer.write(''.join(temp_data))
+            positions.append((line_num, param_num))
+            formats.append('.3' if line_num%3==2 else '.4')
+        return CompiledTemplate(temp_data, positions, formats)
 
     def _kw_to_pos(self, keyword: str) -> tuple:
         '''
@@ -8,9 +8,19 @@ class MapmtIO(FileIO):
         super().__init__(name)
         self.params = AERO_FILE_PARAMS
 
-    def read_file(self, input_path: Path) -> dict:
+    def read_file(self, input_path: Path, keywords=None) -> dict:
         file_raw_data = self.read_input_file(input_path)
         file_data = {}
+        if keywords is not None:
+            lookup = self._get_lookup(keywords)
+            for line in file_raw_data:
+                line_struc = self._clean_line(line)
+                for j, keyword in lookup.get(None, []):
+                    if j < len(line_struc):
+                        file_data[keyword] = float(line_struc[j])
+            self._check_keywords(file_data, keywords, input_path)
+            return file_data
+
         for line in file_raw_data:
             line_struc = self._clean_line(line)
             for j, value in enumerate(line_struc):
@@ -18,6 +28,10 @@ class MapmtIO(FileIO):
                 file_data[key] = float(value)
         return file_data
 
+    def _compile_keywords(self, keywords: tuple) -> dict:
+        positions = {f'mapmt_{param}': (None, j) for j, param in self.params.items()}
+        return self._positions_to_lookup(positions, keywords)
+
 
     def create_file(self, output_path: Path, tmep_path: Path, evt_data: dict) -> None:
         raise NotImplementedError('Aerogel file creation method not implemented \
@@ -5,6 +5,7 @@ Optical file IO
 from pathlib import Path
 
 from .file_io import FileIO
+from .template import CompiledTemplate
 from .reader_structs import (OPT_FILE_LINES, OPT_FILE_PARAMS)
 
 class OpticalIO(FileIO):
@@ -19,35 +20,75 @@ class OpticalIO(FileIO):
         self.lines = OPT_FILE_LINES
         self.params = OPT_FILE_PARAMS
 
-    def read_file(self, input_path: Path) -> dict:
+    def read_file(self, input_path: Path, keywords=None) -> dict:
         '''
         Read data from the optical file
 
         Parameters:
             input_path: Path to the optical file parameters
+            keywords: If provided only these keywords are parsed
 
         Return:
             file_data: Preprocessed data
         '''
         file_raw_data = self.read_input_file(input_path)
         file_data = {}
+        if keywords is not None:
+            lookup = self._get_lookup(keywords)
+            for i, line in enumerate(file_raw_data):
+                if i not in lookup:
+                    continue
+                line_struc = self._clean_line(line)
+                for j, keyword in lookup[i]:
+                    file_data[keyword] = float(line_struc[j])
+            self._check_keywords(file_data, keywords, input_path)
+            return file_data
+
         for i, line in enumerate(file_raw_data):
             if i % 2 == 0:
                 continue
             line_struc = self._clean_line(line)
             line_name = self.lines[i//2]
-            idx = None
-            shift = None
-            if 'aerogel' in line_name:
-                idx, shift = [0,1,2,3], 0
-            elif 'mapmt' in line_name:
-                idx, shift = [3,4], 3
-            else:
-                idx, shift = [2,3], 2
+            idx, shift = self._line_columns(line_name)
             for j in idx:
                 file_data[f'{line_name}_{self.params[j]}'] = float(line_struc[j-shift])
         return file_data
 
+    def _compile_keywords(self, keywords: tuple) -> dict:
+        '''
+        Resolve keywords to the lines and columns of the optical file
+
+        Parameters:
+            keywords: Keywords to parse
+
+        Return:
+            lookup: Line number to list of (column, keyword) pairs
+        '''
+        positions = {}
+        for lid, line_name in OPT_FILE_LINES.items():
+            idx, shift = self._line_columns(line_name)
+            for j in idx:
+                positions[f'{line_name}_{OPT_FILE_PARAMS[j]}'] = (lid*2 + 1, j - shift)
+        return self._positions_to_lookup(positions, keywords)
+
+    @staticmethod
+    def _line_columns(line_name: str) -> tuple:
+        '''
+        Parameters ids and shift of the values in the line
+
+        Parameters:
+            line_name: Name of the line
+
+        Return:
+            idx: Parameters ids in the line
+            shift: First parameter id
+        '''
+        if 'aerogel' in line_name:
+            return [0,1,2,3], 0
+        if 'mapmt' in line_name:
+            return [3,4], 3
+        return [2,3], 2
+
     def create_file(self, output_path: Path, temp_path: Path, evt_data) -> None:
         '''
         Read optical file template and create similar optical file with new parameters
@@ -57,18 +98,26 @@ class OpticalIO(FileIO):
             temp_path: Template file path
             evt_data: Data to change in generated optical file
         '''
+        template = self.compile_template(temp_path, list(evt_data.keys()))
+        template.write(output_path, list(evt_data.values()))
+
+    def compile_template(self, temp_path: Path, keywords: list) -> CompiledTemplate:
+        '''
+        Parse optical template file once and resolve keywords to fixed slots
+
+        Parameters:
+            temp_path: Template file path
+            keywords: Keywords to change in generated optical files
+
+        Return:
+            template: Compiled optical template
+        '''
         temp_data = self.read_input_file(temp_path)
-        self.lines = {v:k for k,v in self.lines.items()}
-        self.params = {v:k for k,v in self.params.items()}
-        for key, value in evt_data.items():
-            line_num, param_num = self._kw_to_pos(key)
-            line = temp_data[line_num]
-            line = self._clean_line(line)
-            line[param_num] = f'{value:.6}'
-            temp_data[line_num] = ' '.join(line) + '\n'
-
-        with open(output_path, 'w', encoding="utf8") as file_writer:
-            file_writer.write(''.join(temp_data))
+        self.lines = {v:k for k,v in OPT_FILE_LINES.items()}
+        self.params = {v:k for k,v in OPT_FILE_PARAMS.items()}
+        positions = [self._kw_to_pos(key) for key in keywords]
+        formats = ['.6'] * len(positions)
+        return CompiledTemplate(temp_data, positions, formats)
 
     def _kw_to_pos(self, keyword: str) -> tuple:
         '''
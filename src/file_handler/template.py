@@ -0,0 +1,81 @@
+'''
+Compiled template to render many files from one parsed template
+'''
+from pathlib import Path
+
+import numpy as np
+
+from .file_io import FileIO
+
+class CompiledTemplate():
+    '''
+    Template with every keyword resolved to a fixed slot
+    '''
+    def __init__(self, temp_data: list, positions: list, formats: list) -> None:
+        '''
+        Init method
+
+        Parameters:
+            temp_data: Template file lines
+            positions: (line number, position number) of each slot
+            formats: Format spec of each slot value
+        '''
+        self.formats = list(formats)
+
+        line_slots = {}
+        for slot, (line_num, param_num) in enumerate(positions):
+            line_slots.setdefault(line_num, {})[param_num] = slot
+
+        pieces = []
+        for line_num, line in enumerate(temp_data):
+            if line_num not in line_slots:
+                pieces.append(self._escape(line))
+                continue
+            line_struc = [self._escape(value) for value in FileIO._clean_line(line)]
+            for param_num, slot in line_slots[line_num].items():
+                line_struc[param_num] = f'{{{slot}}}'
+            pieces.append(' '.join(line_struc) + '\n')
+        self.template = ''.join(pieces)
+
+    def render(self, values) -> str:
+        '''
+        Render single file content
+
+        Parameters:
+            values: Slot values, length K
+
+        Return:
+            File content
+        '''
+        if isinstance(values, np.ndarray):
+            values = values.tolist()
+        return self.template.format(*[format(value, spec) for value, spec in zip(values, self.formats)])
+
+    def write(self, output_path: Path, values) -> None:
+        '''
+        Render single file and save it
+
+        Parameters:
+            output_path: Output file path
+            values: Slot values, length K
+        '''
+        with open(output_path, 'w', encoding="utf8") as file_writer:
+            file_writer.write(self.render(values))
+
+    def write_many(self, output_paths: list, values: np.ndarray) -> None:
+        '''
+        Render N files from (N, K) values array
+
+        Parameters:
+            output_paths: N output file paths
+            values: (N, K) slot values
+        '''
+        for output_path, row in zip(output_paths, np.asarray(values).tolist()):
+            self.write(output_path, row)
+
+    @staticmethod
+    def _escape(text: str) -> str:
+        '''
+        Escape format braces in the template text
+        '''
+        return text.replace('{', '{{').replace('}', '}}')
@@ -3,6 +3,7 @@ Topology file IO
 '''
 #from __future__ import absolute_import
 from pathlib import Path
+import re
 
 from .file_io import FileIO
 from .reader_structs import TOP_FILE_PARAMS
@@ -18,18 +19,34 @@ class TopologyIO(FileIO):
         super().__init__(name)
         self.params = TOP_FILE_PARAMS
 
-    def read_file(self, input_path: Path) -> dict:
+    def read_file(self, input_path: Path, keywords=None) -> dict:
         '''
         Read file and parse it to the dict
 
         Parameters:
             input_path: Path to the input file
+            keywords: If provided only these keywords are parsed
 
         Return:
             file_data: Parsed dictinory
         '''
         file_raw_data = self.read_input_file(input_path)
         file_data = {}
+        if keywords is not None:
+            lookup = self._get_lookup(keywords)
+            for line in file_raw_data:
+                line_key = line.split(None, 2)[:2]
+                if len(line_key) < 2:
+                    continue
+                line_key = (int(line_key[0]) + 1, int(line_key[1]))
+                if line_key not in lookup:
+                    continue
+                line_struc = self._clean_line(line)
+                for j, keyword in lookup[line_key]:
+                    file_data[keyword] = float(line_struc[j])
+            self._check_keywords(file_data, keywords, input_path)
+            return file_data
+
         for line in file_raw_data:
             line_struc = self._clean_line(line)
             layer_id = int(line_struc[0]) + 1
@@ -37,9 +54,29 @@ class TopologyIO(FileIO):
             for j, value in enumerate(line_struc[2:]):
                 key_name = f'{self.name}_aerogel_b{layer_id}_tile_{tile_id}_{self.params[j]}'
                 file_data[key_name] = float(value)
-        print(file_data)
         return file_data
 
+    def _compile_keywords(self, keywords: tuple) -> dict:
+        '''
+        Resolve keywords to the (layer id, tile id) lines and columns
+
+        Parameters:
+            keywords: Keywords to parse
+
+        Return:
+            lookup: (layer id, tile id) to list of (column, keyword) pairs
+        '''
+        params = {param: j for j, param in self.params.items()}
+        name = re.escape(str(self.name))
+        pattern = re.compile(rf'^{name}_aerogel_b(\d+)_tile_(\d+)_({"|".join(params)})$')
+        positions = {}
+        for keyword in keywords:
+            match = pattern.match(keyword)
+            if match:
+                layer_id, tile_id, param = match.groups()
+                positions[keyword] = ((int(layer_id), int(tile_id)), params[param] + 2)
+        return self._positions_to_lookup(positions, keywords)
+
     def create_file(self, output_path: Path, temp_path: Path, evt_data: dict) -> None:
         '''
         Read template file and create similar file with new parameters
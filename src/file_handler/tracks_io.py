@@ -1,4 +1,5 @@
 from pathlib import Path
+import re
 
 from .file_io import FileIO
 from .reader_structs import TRACKS_PARAMS
@@ -9,9 +10,21 @@ class TracksIO(FileIO):
         super().__init__(name)
         self.params = TRACKS_PARAMS
 
-    def read_file(self, input_path):
+    def read_file(self, input_path, keywords=None):
         file_raw_data = self.read_input_file(input_path)
         file_data = {}
+        if keywords is not None:
+            lookup = self._get_lookup(keywords)
+            for line in file_raw_data:
+                pmt_id = line.split(None, 1)[:1]
+                if not pmt_id or pmt_id[0] not in lookup:
+                    continue
+                line_struc = self._clean_line(line)
+                for j, keyword in lookup[pmt_id[0]]:
+                    file_data[keyword] = float(line_struc[j])
+            self._check_keywords(file_data, keywords, input_path)
+            return file_data
+
         for line in file_raw_data:
             line_struc = self._clean_line(line)
             pmt_id = line_struc[0]
@@ -20,6 +33,17 @@ class TracksIO(FileIO):
                 file_data[key] = float(value)
         return file_data
 
+    def _compile_keywords(self, keywords):
+        params = {param: j for j, param in self.params.items()}
+        pattern = re.compile(rf'^track_pmt_(.+?)_({"|".join(params)})$')
+        positions = {}
+        for keyword in keywords:
+            match = pattern.match(keyword)
+            if match:
+                pmt_id, param = match.groups()
+                positions[keyword] = (pmt_id, params[param] + 1)
+        return self._positions_to_lookup(positions, keywords)
+
 
     def create_file(self, output_path, temp_path, evt_data):
         raise NotImplementedError('Error')
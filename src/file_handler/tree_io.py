@@ -0,0 +1,75 @@
+'''
+Bulk writer of column tables into ROOT TTree and ROOT-free sidecar files
+'''
+# To skip ROOT pylint errors
+#pylint: disable=E1101
+from pathlib import Path
+
+import numpy as np
+
+class TreeIO():
+    '''
+    Write whole NumPy columns at once
+    '''
+    def __init__(self, tree_name='evtTree') -> None:
+        '''
+        Init method
+
+        Parameters:
+            tree_name: Name of the TTree
+        '''
+        self.tree_name = tree_name
+
+    def write(self, output_path: Path, columns: dict) -> None:
+        '''
+        Write columns into ROOT file TTree in one call
+
+        Parameters:
+            output_path: ROOT file path
+            columns: Branch name to 1D values array. All arrays should have the same length.
+        '''
+        import ROOT # pylint: disable=import-outside-toplevel
+
+        columns = self._prepare(columns)
+        if len(columns) == 0:
+            root_file = ROOT.TFile.Open(str(output_path), 'RECREATE')
+            ROOT.TTree(self.tree_name, self.tree_name).Write()
+            root_file.Close()
+            return
+
+        from_numpy = getattr(ROOT.RDF, 'FromNumpy', None) or ROOT.RDF.MakeNumpyDataFrame
+        data_frame = from_numpy(columns)
+        data_frame.Snapshot(self.tree_name, str(output_path))
+
+    def write_sidecar(self, output_path: Path, columns: dict) -> None:
+        '''
+        Write the same table without ROOT. File format is defined by the suffix,
+        either ".npz" or ".csv".
+
+        Parameters:
+            output_path: Output file path
+            columns: Column name to 1D values array
+        '''
+        columns = self._prepare(columns)
+        output_path = Path(output_path)
+        if output_path.suffix == '.npz':
+            np.savez(output_path, **columns)
+        elif output_path.suffix == '.csv':
+            names = list(columns)
+            table = np.column_stack(list(columns.values())) if names else np.zeros((0, 0))
+            np.savetxt(output_path, table, delimiter=',', header=','.join(names), comments='', fmt='%.17g')
+        else:
+            raise TypeError(f'Sidecar file should have ".npz" or ".csv" extension! Got {output_path.name}')
+
+    @staticmethod
+    def _prepare(columns: dict) -> dict:
+        '''
+        Convert columns to contiguous float64 arrays
+
+        Parameters:
+            columns: Column name to values
+
+        Return:
+            Column name to contiguous float64 arrays
+        '''
+        return {name: np.ascontiguousarray(values, dtype=np.float64) for name, values in columns.items()}
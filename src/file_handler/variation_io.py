@@ -12,7 +12,7 @@ class VariationIO(FileIO):
         self.lines = VARIATION_FILE_LINES
     
 
-    def read_file(self, input_path: Path) -> dict:
+    def read_file(self, input_path: Path, keywords=None) -> dict:
         '''
         '''
         file_raw_data = self.read_input_file(input_path)
@@ -33,6 +33,8 @@ class VariationIO(FileIO):
                     kw += f'{line_struc[2]}_'
                 kw += f'{self.params[j]}'
                 file_data[kw] = float(value)
+        if keywords is not None:
+            file_data = {keyword: file_data[keyword] for keyword in keywords}
         return file_data
 
     def create_file(self, ):
@@ -57,55 +57,198 @@ class BaseMinimizer:
         points = np.array(points)
         return points
 
+    @staticmethod
+    def get_bounds(in_space):
+        '''
+        Input space box bounds
+
+        Parameters:
+            in_space (dict): Input space information
+
+        Return:
+            lows (torch.tensor): Lower bound of each feature
+            highs (torch.tensor): Upper bound of each feature
+        '''
+        space = torch.tensor([[val_min, val_max] for val_min, val_max, _ in in_space['space']], \
+dtype=torch.float).reshape((-1, 2))
+        return space[:, 0], space[:, 1]
+
     def min_error_calc(self, point, sigma, up, iters, step, limit):
-        #TODO: IMPOVE THIS FUNCTION
         '''
-        MINUIT error calculation algorithm
+        MINUIT error calculation algorithm in one direction
 
         Parameters:
-            point (torch.tensor):
+            point (torch.tensor): Minimum point
             sigma (UNKNOWN): TO BE IMPLEMENTED
             up (float): Error calculation value
             iters (int): Number of iterations for fine calculation
-            step (float): Size to find error range
+            step (float): Size to find error range, the sign defines the direction
             limit (float): Max error size point relative
 
         Return:
             errs (list): Calculated errors for the features
         '''
-        errs = []
-        point = torch.tensor(point, dtype=torch.float)
-        y0 = self.model.predict(point).sum()
-        for i in range(len(point)):
-            curr_p = point.clone()
-            up_step = None
-            down_step = None
-            j=1
-            while True:
-                if ((1 + j*step) - limit)*step > 0:
-                    break
-                curr_p[i] = point[i] + torch.abs(point[i])*j*step
-                curr_y = self.model.predict(curr_p).sum()
-                if (curr_y - y0) > 1:
-                    up_step = point[i] + torch.abs(point[i])*j*step
-                    down_step = point[i] + torch.abs(point[i])*(j-1)*step
-                    break
-                j+=1
-            if up_step is None:
-                errs.append(abs(float((abs(limit)-1)*point[i])))
-                continue
-
-            for k in range(iters):
-                curr_p = point.clone()
-                curr_p[i] = (up_step + down_step)/2
-                curr_y = self.model.predict(curr_p).sum()
-                if torch.abs((curr_y -y0) - up) < 1e-3:
-                    errs.append(float(torch.abs(curr_p[i]-point[i])))
-                    break
-                if curr_y - y0 > 1:
-                    up_step = curr_p[i]
-                else:
-                    down_step = curr_p[i]
-            if (k+1) == iters:
-                errs.append(float(torch.abs(curr_p[i]-point[i])))
-        return errs
+        sign = 1 if step > 0 else -1
+        return self._error_scan(point, up, iters, abs(step), abs(limit), [sign])[0]
+
+    def min_error_scan(self, point, up, iters, step, limit):
+        '''
+        MINUIT error calculation algorithm for both directions at once
+
+        Parameters:
+            point (torch.tensor): Minimum point
+            up (float): Error calculation value
+            iters (int): Number of iterations for fine calculation
+            step (float): Size to find error range
+            limit (float): Max error size point relative
+
+        Return:
+            pos_errs (list): Positive errors for the features
+            neg_errs (list): Negative errors for the features
+        '''
+        pos_errs, neg_errs = self._error_scan(point, up, iters, abs(step), abs(limit), [1, -1])
+        return pos_errs, neg_errs
+
+    def hesse(self, point, up, fixed=None):
+        '''
+        Parabolic errors from the Hessian of the summed chi2 at the minimum.
+        The Hessian is built from central differences of autograd gradients with
+        feature precisions as steps. The autograd Hessian is not used, it is zero
+        for piecewise linear (ReLU) networks. Fixed features are not in the
+        Hessian, their covariance and errors are zero. Features with non-positive
+        variance (bound or saddle point) get NaN errors and zero correlations.
+
+        Parameters:
+            point (torch.tensor): Minimum point
+            up (float): Error calculation value
+            fixed (list): Indexes of the fixed features, e.g. charge
+
+        Return:
+            cov (np.array): Covariance matrix
+            corr (np.array): Correlation coefficients matrix
+            errs (list): Parabolic errors for the features
+        '''
+        point = torch.as_tensor(np.asarray(point, dtype=float), dtype=torch.float).flatten()
+        dim = len(point)
+        fixed = set(fixed or [])
+        free = [num for num in range(dim) if num not in fixed]
+
+        hess = self._gradient_hessian(point, free)
+        if not self._is_pos_def(hess):
+            print('WARNING: Hessian is not positive definite, pseudo-inverse is used!')
+
+        free_cov = 2*up*torch.linalg.pinv(hess)
+        variances = torch.diagonal(free_cov).clone()
+        bad = ~(variances > 0)
+        if bad.any():
+            bad_features = [free[num] for num in torch.nonzero(bad).flatten().tolist()]
+            print(f'WARNING: Variances of features {bad_features} are not positive, their errors are NaN!')
+            variances[bad] = 1
+        free_errs = torch.sqrt(variances)
+        free_corr = free_cov/torch.outer(free_errs, free_errs)
+        free_corr[bad, :] = 0
+        free_corr[:, bad] = 0
+        free_corr[bad, bad] = 1
+        free_errs[bad] = float('nan')
+        cov = torch.zeros((dim, dim), dtype=torch.double)
+        corr = torch.eye(dim, dtype=torch.double)
+        errs = torch.zeros(dim, dtype=torch.double)
+        idx = torch.tensor(free, dtype=torch.long)
+        cov[idx[:, None], idx] = free_cov
+        corr[idx[:, None], idx] = free_corr
+        errs[idx] = free_errs
+        return cov.numpy(), corr.numpy(), errs.tolist()
+
+    def _gradient_hessian(self, point, free=None):
+        '''
+        Hessian from central differences of autograd gradients, one model call
+        for all 2*F shifted points
+
+        Parameters:
+            point (torch.tensor): Minimum point
+            free (list): Indexes of the features to shift, all by default
+
+        Return:
+            hess (torch.tensor): (F, F) symmetrized Hessian of the free features
+        '''
+        free = list(range(len(point))) if free is None else list(free)
+        steps = torch.tensor(self.precisions, dtype=torch.float)[free]
+        shifts = torch.zeros((len(free), len(point)))
+        shifts[torch.arange(len(free)), free] = steps
+        points = torch.cat((point + shifts, point - shifts)).requires_grad_(True)
+        chi2 = self.model.predict(points, grad=True).sum()
+        grads, = torch.autograd.grad(chi2, points)
+        grads = grads[:, free]
+        hess = ((grads[:len(free)] - grads[len(free):])/(2*steps.reshape((-1, 1)))).double()
+        return (hess + hess.T)/2
+
+    @staticmethod
+    def _is_pos_def(matrix):
+        '''
+        Check if matrix is positive definite
+        '''
+        return bool(torch.isfinite(matrix).all()) and torch.linalg.cholesky_ex(matrix).info == 0
+
+    def _error_scan(self, point, up, iters, step, limit, signs):
+        '''
+        Profile scan where every (direction, feature) pair is one lane. All lanes
+        are stepped outward together until chi2 rises by more than up, then the
+        brackets are bisected together. Each step is one model call.
+
+        Parameters:
+            point (torch.tensor): Minimum point
+            up (float): Error calculation value
+            iters (int): Number of bisection iterations
+            step (float): Step size relative to the feature value
+            limit (float): Max error size point relative
+            signs (list): Directions to scan, 1 or -1
+
+        Return:
+            errs (list): Calculated errors list for each direction
+        '''
+        point = torch.as_tensor(np.asarray(point, dtype=float), dtype=torch.float).flatten()
+        dim = len(point)
+        y0 = self.model.predict(point.reshape((1, -1))).sum()
+
+        lanes_dim = torch.arange(dim).repeat(len(signs))
+        lanes_dir = torch.tensor(signs, dtype=torch.float).repeat_interleave(dim)
+        lanes_step = lanes_dir*torch.abs(point[lanes_dim])*step
+
+        def lanes_delta(lanes, shifts):
+            pts = point.repeat((len(lanes), 1))
+            pts[torch.arange(len(lanes)), lanes_dim[lanes]] += shifts
+            return self.model.predict(pts).sum(axis=1) - y0
+
+        # Bracketing
+        up_shift = torch.full((len(lanes_dim),), float('nan'))
+        active = torch.arange(len(lanes_dim))
+        j = 1
+        while len(active) != 0 and (1 + j*step) <= limit:
+            delta = lanes_delta(active, lanes_step[active]*j)
+            crossed = delta > up
+            up_shift[active[crossed]] = j
+            active = active[~crossed]
+            j += 1
+
+        errs = torch.abs((limit - 1)*point[lanes_dim])
+        bracketed = torch.nonzero(~torch.isnan(up_shift)).flatten()
+        up_step = lanes_step[bracketed]*up_shift[bracketed]
+        down_step = lanes_step[bracketed]*(up_shift[bracketed] - 1)
+
+        # Bisection
+        active = torch.arange(len(bracketed))
+        mid_step = (up_step + down_step)/2
+        for _ in range(iters):
+            if len(active) == 0:
+                break
+            mid_step[active] = (up_step[active] + down_step[active])/2
+            delta = lanes_delta(bracketed[active], mid_step[active])
+            stuck = (mid_step[active] == up_step[active]) | (mid_step[active] == down_step[active])
+            done = (torch.abs(delta - up) < 1e-3) | stuck
+            above = delta > up
+            up_step[active[above]] = mid_step[active[above]]
+            down_step[active[~above]] = mid_step[active[~above]]
+            active = active[~done]
+        errs[bracketed] = torch.abs(mid_step)
+
+        return [errs[num*dim:(num+1)*dim].tolist() for num in range(len(signs))]
@@ -0,0 +1,144 @@
+'''
+CMA-ES minimizer module
+'''
+import math
+
+import torch
+from tqdm import tqdm
+from .base_minimizer import BaseMinimizer
+
+class CMAESMinimizer(BaseMinimizer):
+    '''
+    Covariance Matrix Adaptation Evolution Strategy minimizer
+    '''
+    def __init__(self, model):
+        '''
+        Init function
+
+        Parameters:
+            model (Predictor): Loaded model for prediction
+        '''
+        super().__init__(model)
+
+    def minimize(self, in_space, **kwargs):
+        '''
+        Minima finding algorithm. Runs in coordinates divided by the feature
+        precisions. The initial covariance is diagonal with a quarter of each
+        feature range as its spread, so a narrow feature (e.g. charge) does not
+        shrink the steps of the others. Restarts evolve together and each generation of all restarts is
+        evaluated with one model call.
+
+        Parameters:
+            in_space (dict): Input space information
+            **kwargs (dict): Useful information. "iters" is the number of restarts,
+                "number_of_samples" is the population size
+
+        Return:
+            min_point (torch.tensor): Calculated minima
+            min_error (np.array): Calculated error from restarts spread
+        '''
+        restarts = kwargs['iters']
+        pop_size = max(kwargs['number_of_samples'], 4)
+        max_gens = kwargs.get('max_generations', 1000)
+
+        precisions = torch.tensor(self.precisions, dtype=torch.double)
+        lows, highs = self.get_bounds(in_space)
+        lows, highs = lows.double()/precisions, highs.double()/precisions
+        dim = len(precisions)
+        params = self._strategy_params(dim, pop_size)
+
+        mean = torch.tensor(self.get_start_points(in_space, restarts), dtype=torch.double)/precisions
+        # Initial spread is a quarter of each feature range, at least one precision
+        ranges = torch.clamp(highs - lows, min=1)
+        sigma = torch.ones(restarts, dtype=torch.double)
+        cov = torch.diag(ranges/4).repeat((restarts, 1, 1))**2
+        path_c = torch.zeros((restarts, dim), dtype=torch.double)
+        path_s = torch.zeros((restarts, dim), dtype=torch.double)
+        best_x = mean.clone()
+        best_f = torch.full((restarts,), float('inf'), dtype=torch.double)
+        active = torch.ones(restarts, dtype=torch.bool)
+
+        for gen in tqdm(range(max_gens)):
+            idx = torch.nonzero(active).flatten()
+            if len(idx) == 0:
+                break
+            eig_vals, basis = torch.linalg.eigh(cov[idx])
+            scales = torch.sqrt(torch.clamp(eig_vals, min=1e-20))
+
+            # Sample, clip into the box and recompute steps of the clipped points
+            z = torch.randn((len(idx), pop_size, dim), dtype=torch.double)
+            steps = (z*scales.unsqueeze(1)) @ basis.transpose(1, 2)
+            x = mean[idx].unsqueeze(1) + sigma[idx].reshape((-1, 1, 1))*steps
+            x = torch.maximum(torch.minimum(x, highs), lows)
+            steps = (x - mean[idx].unsqueeze(1))/sigma[idx].reshape((-1, 1, 1))
+
+            fitness = self.model.predict((x*precisions).float().reshape((-1, dim))).sum(axis=1)
+            fitness = fitness.double().reshape((len(idx), pop_size))
+
+            order = torch.argsort(fitness, dim=1)
+            gen_best = fitness.gather(1, order[:, :1]).flatten()
+            improved = gen_best < best_f[idx]
+            best_f[idx[improved]] = gen_best[improved]
+            best_x[idx[improved]] = x[improved, order[improved, 0]]
+
+            selected = steps.gather(1, order[:, :params['mu']].unsqueeze(2).expand((-1, -1, dim)))
+            step_w = (params['weights'].reshape((1, -1, 1))*selected).sum(axis=1)
+            mean[idx] = mean[idx] + sigma[idx].reshape((-1, 1))*step_w
+
+            inv_sqrt = basis @ torch.diag_embed(1/scales) @ basis.transpose(1, 2)
+            path_s[idx] = (1 - params['cs'])*path_s[idx] + \
+math.sqrt(params['cs']*(2 - params['cs'])*params['mueff'])*(inv_sqrt @ step_w.unsqueeze(2)).squeeze(2)
+            ps_norm = torch.linalg.norm(path_s[idx], dim=1)
+            hsig = (ps_norm/math.sqrt(1 - (1 - params['cs'])**(2*(gen + 1)))/params['chi_n'] < \
+1.4 + 2/(dim + 1)).double().reshape((-1, 1))
+            path_c[idx] = (1 - params['cc'])*path_c[idx] + \
+hsig*math.sqrt(params['cc']*(2 - params['cc'])*params['mueff'])*step_w
+
+            rank_one = path_c[idx].unsqueeze(2)*path_c[idx].unsqueeze(1) + \
+((1 - hsig)*params['cc']*(2 - params['cc'])).unsqueeze(2)*cov[idx]
+            rank_mu = torch.einsum('m,rmi,rmj->rij', params['weights'], selected, selected)
+            cov[idx] = (1 - params['c1'] - params['cmu'])*cov[idx] + \
+params['c1']*rank_one + params['cmu']*rank_mu
+            cov[idx] = (cov[idx] + cov[idx].transpose(1, 2))/2
+            sigma[idx] = sigma[idx]*torch.exp((params['cs']/params['damps'])*(ps_norm/params['chi_n'] - 1))
+
+            # Converged when the search distribution is much smaller than the precisions
+            spread = sigma[idx]*scales.max(axis=1).values
+            active[idx[spread < 1e-2]] = False
+
+        mins = (best_x*precisions).numpy()
+        min_point = mins.mean(axis=0)
+        min_error = mins.std(axis=0)
+        return min_point, min_error
+
+    @staticmethod
+    def _strategy_params(dim, pop_size):
+        '''
+        Default CMA-ES strategy parameters
+
+        Parameters:
+            dim (int): Number of features
+            pop_size (int): Population size
+
+        Return:
+            params (dict): Recombination weights and learning rates
+        '''
+        mu = pop_size//2
+        weights = torch.log(torch.tensor(mu + 0.5, dtype=torch.double)) - \
+torch.log(torch.arange(1, mu + 1, dtype=torch.double))
+        weights = weights/weights.sum()
+        mueff = float(1/(weights**2).sum())
+
+        cs = (mueff + 2)/(dim + mueff + 5)
+        c1 = 2/((dim + 1.3)**2 + mueff)
+        return {
+            'mu': mu,
+            'weights': weights,
+            'mueff': mueff,
+            'cc': (4 + mueff/dim)/(dim + 4 + 2*mueff/dim),
+            'cs': cs,
+            'c1': c1,
+            'cmu': min(1 - c1, 2*(mueff - 2 + 1/mueff)/((dim + 2)**2 + mueff)),
+            'damps': 1 + 2*max(0, math.sqrt((mueff - 1)/(dim + 1)) - 1) + cs,
+            'chi_n': math.sqrt(dim)*(1 - 1/(4*dim) + 1/(21*dim**2))
+            }
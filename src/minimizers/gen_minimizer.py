@@ -2,7 +2,6 @@
 Genetic algorithm module
 '''
 import torch
-import numpy as np
 from tqdm import tqdm
 from .base_minimizer import BaseMinimizer
 
@@ -21,7 +20,8 @@ class GenMinimizer(BaseMinimizer):
 
     def minimize(self, in_space, **kwargs):
         '''
-        Minima finding algorithm
+        Minima finding algorithm. All restarts evolve together as one
+        (iters, number_of_samples, D) population.
 
         Parameters:
             in_space (dict): Input space information
@@ -31,28 +31,37 @@ class GenMinimizer(BaseMinimizer):
             min_point (torch.tensor): Calculated minima
             min_error (np.array): Calculated error (zeros only cannot calculate convergence)
         '''
-        mins = []
+        restarts, samples = kwargs['iters'], kwargs['number_of_samples']
+        num_of_best = int(0.2*samples)+1
+
+        points = self.get_start_points(in_space, restarts*samples)
+        points = torch.tensor(points, dtype=torch.float).reshape((restarts, samples, -1))
+        fitness = self._get_fitness(points)
+
+        active = torch.ones(restarts, dtype=torch.bool)
         prev_best_points = None
-        for _ in tqdm(range(kwargs['iters'])):
-            points = self.get_start_points(in_space, kwargs['number_of_samples'])
-            for _ in range(20000):
-                fitness = self._get_fitness(points)
-
-                best_points = points[np.argsort(fitness)][:int(0.2*len(points))+1]
-
-                if prev_best_points is not None:
-                    if ((prev_best_points - best_points)**2).mean() < 1e-4:
-                        break
-                prev_best_points = best_points
-                crosses = self._generat_points(best_points, in_space, **kwargs)
-                cross_fitness = self._get_fitness(crosses)
-                all_fitnesses = fitness + cross_fitness
-                points = np.vstack((points, crosses))
-                new_points = points[np.argsort(all_fitnesses)][:kwargs['number_of_samples']]
-                points = new_points
-            mins.append(new_points[0])
-
-        mins = np.array(mins)
+        for _ in tqdm(range(20000)):
+            order = torch.argsort(fitness, dim=1)
+            points = self._take_rows(points, order)
+            fitness = torch.gather(fitness, 1, order)
+            best_points = points[:, :num_of_best]
+
+            if prev_best_points is not None:
+                active &= ((prev_best_points - best_points)**2).mean(axis=(1, 2)) >= 1e-4
+                if not active.any():
+                    break
+            prev_best_points = best_points.clone()
+
+            idx = torch.nonzero(active).flatten()
+            crosses = self._generat_points(best_points[idx], in_space, **kwargs)
+            cross_fitness = self._get_fitness(crosses)
+            all_points = torch.cat((points[idx], crosses), dim=1)
+            all_fitnesses = torch.cat((fitness[idx], cross_fitness), dim=1)
+            order = torch.argsort(all_fitnesses, dim=1)[:, :samples]
+            points[idx] = self._take_rows(all_points, order)
+            fitness[idx] = torch.gather(all_fitnesses, 1, order)
+
+        mins = points[:, 0].numpy()
         min_point = mins.mean(axis=0)
         min_error = mins.std(axis=0)
 
@@ -60,45 +69,60 @@ class GenMinimizer(BaseMinimizer):
 
     def _generat_points(self, points, in_space, **kwargs):
         '''
-        Generate new points
+        Generate new points with crossover and mutation for all restarts at once
 
         Parameters:
-            points (np.array): Generated points
-            in_space : heto
+            points (torch.tensor): (R, E, D) best points of each restart
+            in_space (dict): Input space information
             **kwargs (dict): Useful information
 
         Return:
-            crosses (np.array): Crossed and mutated points
+            crosses (torch.tensor): (R, C, D) crossed and mutated points
         '''
-        crosses = []
-        while len(crosses) < kwargs['number_of_samples']:
-            rands = points[np.random.randint(0,len(points),len(points)//2)]
-            crosses.append(rands.mean(axis=0))
-            crosses.append(np.append(rands[0, :len(rands[0])//2], rands[1, len(rands[1])//2:]))
-            crosses.append(np.append(rands[1, :len(rands[1])//2], rands[0, len(rands[0])//2:]))
-
-        def mut_coef():
-            yield 2*(np.random.rand()-0.5)
-
-        for cross in crosses:
-            idx = np.random.randint(len(cross))
-            temp_v = (5*next(mut_coef())*self.precisions[idx])
-            if temp_v > 0:
-                cross[idx] = min(cross[idx]+temp_v, in_space['space'][idx][1])
-            else:
-                cross[idx] = max(cross[idx]+temp_v, in_space['space'][idx][0])
-        return np.array(crosses)
+        restarts, num_of_best, dim = points.shape
+        groups = -(-kwargs['number_of_samples']//3)
+        parents = max(num_of_best//2, 2)
+
+        rands_idx = torch.randint(0, num_of_best, (restarts, groups, parents))
+        rands = points[torch.arange(restarts).reshape((-1, 1, 1)), rands_idx]
+        half = dim//2
+        crosses = torch.stack((
+            rands.mean(axis=2),
+            torch.cat((rands[:, :, 0, :half], rands[:, :, 1, half:]), dim=2),
+            torch.cat((rands[:, :, 1, :half], rands[:, :, 0, half:]), dim=2)
+            ), dim=2).reshape((restarts, 3*groups, dim))
+
+        precisions = torch.tensor(self.precisions, dtype=torch.float)
+        mut_idx = torch.randint(0, dim, (restarts, 3*groups, 1))
+        mut_coef = 2*(torch.rand((restarts, 3*groups, 1))-0.5)
+        crosses.scatter_add_(2, mut_idx, 5*mut_coef*precisions[mut_idx])
+
+        lows, highs = self.get_bounds(in_space)
+        return torch.clamp(crosses, lows, highs)
 
     def _get_fitness(self, points):
         '''
-        Get fitness value for points
+        Get fitness value for points with one model call
+
+        Parameters:
+            points (torch.tensor): (..., D) selected points
+
+        Return:
+            fitness (torch.tensor): (...) fitness of each point
+        '''
+        fitness = self.model.predict(points.reshape((-1, points.shape[-1]))).sum(axis=1)
+        return fitness.reshape(points.shape[:-1])
+
+    @staticmethod
+    def _take_rows(points, order):
+        '''
+        Reorder points of each restart
 
         Parameters:
-            points (np.array): Selected points
+            points (torch.tensor): (R, P, D) points
+            order (torch.tensor): (R, K) rows to take
 
         Return:
-            fitness (list): Fitness of each point
+            (R, K, D) points
         '''
-        points = torch.tensor(points, dtype=torch.float)
-        fitness = self.model.predict(points).sum(axis=1).tolist()
-        return fitness
+        return torch.gather(points, 1, order.unsqueeze(2).expand((-1, -1, points.shape[2])))
@@ -0,0 +1,155 @@
+'''
+Grid scan minimizer module
+'''
+import heapq
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import torch
+import numpy as np
+from tqdm import tqdm
+from .base_minimizer import BaseMinimizer
+
+# Model and grid axes of the scanning process
+_WORKER_STATE = {}
+
+def _init_worker(model, axes):
+    '''
+    Keep model and grid axes in the worker process
+
+    Parameters:
+        model (Predictor): Loaded model for predictions
+        axes (list): Grid nodes of each feature
+    '''
+    torch.set_num_threads(1)
+    _WORKER_STATE['model'] = model
+    _WORKER_STATE['axes'] = axes
+
+def _scan_worker(chunk, top_k):
+    '''
+    Scan grid chunk in the worker process
+    '''
+    return GridMinimizer.scan_chunk(_WORKER_STATE['model'], _WORKER_STATE['axes'], chunk, top_k)
+
+class GridMinimizer(BaseMinimizer):
+    '''
+    Exhaustive scan of the in_space grid
+    '''
+    def __init__(self, model):
+        '''
+        Init function
+
+        Parameters:
+            model (Predictor): Loaded model for prediction
+        '''
+        super().__init__(model)
+        self.top_points = None
+        self.top_chi2 = None
+
+    def minimize(self, in_space, **kwargs):
+        '''
+        Minima finding algorithm. The full Cartesian grid of in_space['space'] is
+        streamed through the model in chunks of flat node indices and only the
+        top_k best nodes are kept, so memory does not depend on the grid size.
+
+        Parameters:
+            in_space (dict): Input space information
+            **kwargs (dict): Useful information. "top_k" number of kept nodes,
+                "chunk_size" nodes per model call, "workers" number of processes
+
+        Return:
+            min_point (np.array): Best grid node
+            min_error (np.array): Spread of the top_k best nodes
+        '''
+        top_k = kwargs.get('top_k', 10)
+        chunk_size = kwargs.get('chunk_size', 100000)
+        workers = kwargs.get('workers', 1)
+
+        axes = [np.linspace(val_min, val_max, int(num)) for val_min, val_max, num in in_space['space']]
+        total = 1
+        for axis in axes:
+            total *= len(axis)
+        num_of_chunks = -(-total//chunk_size)
+        chunks = ((start, min(start + chunk_size, total)) for start in range(0, total, chunk_size))
+
+        heap = []
+        if workers > 1:
+            # Torch threads are already running, forking them can deadlock
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker, \
+initargs=(self.model, axes)) as executor:
+                # Keep only a few chunks in flight so pending tasks do not grow with the grid
+                pending = deque()
+                for chunk in tqdm(chunks, total=num_of_chunks):
+                    if len(pending) >= 2*workers:
+                        self._push(heap, pending.popleft().result(), top_k)
+                    pending.append(executor.submit(_scan_worker, chunk, top_k))
+                while pending:
+                    self._push(heap, pending.popleft().result(), top_k)
+        else:
+            for chunk in tqdm(chunks, total=num_of_chunks):
+                self._push(heap, self.scan_chunk(self.model, axes, chunk, top_k), top_k)
+
+        best = sorted((-neg_chi2, idx) for neg_chi2, idx in heap)
+        self.top_chi2 = np.array([chi2 for chi2, _ in best])
+        self.top_points = self._nodes(axes, np.array([idx for _, idx in best], dtype=np.int64))
+
+        min_point = self.top_points[0]
+        min_error = self.top_points.std(axis=0)
+        return min_point, min_error
+
+    @staticmethod
+    def scan_chunk(model, axes, chunk, top_k):
+        '''
+        Evaluate grid nodes of the chunk with one model call
+
+        Parameters:
+            model (Predictor): Loaded model for predictions
+            axes (list): Grid nodes of each feature
+            chunk (tuple): (start, stop) flat node indices
+            top_k (int): Number of best nodes to return
+
+        Return:
+            best (list): (chi2, flat index) of the best chunk nodes
+        '''
+        indices = np.arange(chunk[0], chunk[1], dtype=np.int64)
+        points = GridMinimizer._nodes(axes, indices)
+        with torch.no_grad():
+            chi2 = model.predict(torch.tensor(points, dtype=torch.float)).sum(axis=1).numpy()
+        if len(chi2) > top_k:
+            best = np.argpartition(chi2, top_k)[:top_k]
+        else:
+            best = np.arange(len(chi2))
+        return list(zip(chi2[best].tolist(), indices[best].tolist()))
+
+    @staticmethod
+    def _nodes(axes, indices):
+        '''
+        Grid node coordinates from flat indices
+
+        Parameters:
+            axes (list): Grid nodes of each feature
+            indices (np.array): Flat node indices
+
+        Return:
+            points (np.array): (N, D) node coordinates
+        '''
+        coords = np.unravel_index(indices, [len(axis) for axis in axes])
+        return np.stack([axis[coord] for axis, coord in zip(axes, coords)], axis=1)
+
+    @staticmethod
+    def _push(heap, candidates, top_k):
+        '''
+        Keep top_k lowest chi2 nodes in the max-heap
+
+        Parameters:
+            heap (list): Heap of (-chi2, flat index)
+            candidates (list): (chi2, flat index) new candidates
+            top_k (int): Heap size
+        '''
+        for chi2, idx in candidates:
+            if len(heap) < top_k:
+                heapq.heappush(heap, (-chi2, idx))
+            elif -chi2 > heap[0][0]:
+                heapq.heappushpop(heap, (-chi2, idx))
@@ -0,0 +1,163 @@
+'''
+L-BFGS minimizer module
+'''
+import torch
+import numpy as np
+from tqdm import tqdm
+from .base_minimizer import BaseMinimizer
+
+class LBFGSMinimizer(BaseMinimizer):
+    '''
+    Bounded (projected) L-BFGS minimizer algorithm
+    '''
+    def __init__(self, model):
+        '''
+        Init function
+
+        Parameters:
+            model (Predictor): Loaded model for prediction
+        '''
+        super().__init__(model)
+        self.evaluations = 0
+        self.end_points = None
+
+    def minimize(self, in_space, **kwargs):
+        '''
+        Minima finding algorithm. Every start keeps its own L-BFGS history, line
+        search and convergence test, only the model calls are shared: each line
+        search trial of all searching starts is one model call. Points are clamped
+        to the grid box and the gradient is projected on its active bounds.
+        Coordinates are divided by the feature precisions.
+
+        Parameters:
+            in_space (dict): Input space information
+            **kwargs (dict): Useful information. "iters" max L-BFGS iterations of
+                each start, "max_eval" max number of model calls (default 5*iters)
+
+        Return:
+            min_point (torch.tensor): Calculated minima
+            min_error (np.array): Calculated error from convergence
+        '''
+        max_iter = kwargs['iters']
+        max_eval = kwargs.get('max_eval', 5*max_iter)
+        history = kwargs.get('history_size', 10)
+
+        lows, highs = self.get_bounds(in_space)
+        precisions = torch.tensor(self.precisions, dtype=torch.float)
+        upper = (highs - lows)/precisions
+        start_points = torch.tensor(self.get_start_points(in_space, kwargs['number_of_samples']), \
+dtype=torch.float)
+        u = torch.minimum(torch.clamp((start_points - lows)/precisions, min=0), upper)
+        num_of_starts, dim = u.shape
+
+        def evaluate(points):
+            x = (lows + points*precisions).requires_grad_(True)
+            chi2 = self.model.predict(x, grad=True).sum(axis=1)
+            grad = torch.autograd.grad(chi2.sum(), x)[0]
+            self.evaluations += 1
+            return chi2.detach(), grad.detach()*precisions
+
+        self.evaluations = 0
+        f, g = evaluate(u)
+        s_hist = torch.zeros((num_of_starts, history, dim))
+        y_hist = torch.zeros((num_of_starts, history, dim))
+        rho = torch.zeros((num_of_starts, history))
+        count = torch.zeros(num_of_starts, dtype=torch.long)
+        active = torch.ones(num_of_starts, dtype=torch.bool)
+
+        for _ in tqdm(range(max_iter)):
+            blocked = ((u <= 0) & (g > 0)) | ((u >= upper) & (g < 0))
+            proj_g = torch.where(blocked, torch.zeros_like(g), g)
+            active &= proj_g.abs().amax(axis=1) > 1e-5
+            if not active.any() or self.evaluations >= max_eval:
+                break
+
+            idx = torch.nonzero(active).flatten()
+            d = -self._two_loop(proj_g[idx], s_hist[idx], y_hist[idx], rho[idx], count[idx])
+            d[blocked[idx]] = 0
+            not_descent = (d*proj_g[idx]).sum(axis=1) >= 0
+            d[not_descent] = -proj_g[idx][not_descent]
+            count[idx[not_descent]] = 0
+
+            # First step of a start without history is one precision long
+            step = torch.where(count[idx] == 0, 1/torch.clamp(torch.linalg.norm(d, dim=1), min=1e-12), \
+torch.ones(len(idx)))
+            step = torch.clamp(step, max=1)
+            new_u, new_f, new_g = u[idx].clone(), f[idx].clone(), g[idx].clone()
+            accepted = torch.zeros(len(idx), dtype=torch.bool)
+            searching = torch.arange(len(idx))
+            for _ in range(20):
+                rows = idx[searching]
+                trial = torch.minimum(torch.clamp(u[rows] + step[searching, None]*d[searching], min=0), upper)
+                trial_f, trial_g = evaluate(trial)
+                armijo = trial_f <= f[rows] + 1e-4*(g[rows]*(trial - u[rows])).sum(axis=1)
+                ok = searching[armijo]
+                new_u[ok], new_f[ok], new_g[ok] = trial[armijo], trial_f[armijo], trial_g[armijo]
+                accepted[ok] = True
+                searching = searching[~armijo]
+                step[searching] /= 2
+                if len(searching) == 0 or self.evaluations >= max_eval:
+                    break
+
+            # A start whose line search failed is converged, the others go on
+            active[idx[~accepted]] = False
+            rows, acc_u, acc_f, acc_g = idx[accepted], new_u[accepted], new_f[accepted], new_g[accepted]
+            s_vec, y_vec = acc_u - u[rows], acc_g - g[rows]
+            curvature = (s_vec*y_vec).sum(axis=1)
+            update = curvature > 1e-10
+            upd_rows = rows[update]
+            pos = count[upd_rows] % history
+            s_hist[upd_rows, pos] = s_vec[update]
+            y_hist[upd_rows, pos] = y_vec[update]
+            rho[upd_rows, pos] = 1/curvature[update]
+            count[upd_rows] += 1
+
+            small_change = (f[rows] - acc_f).abs() <= 1e-9*(1 + acc_f.abs())
+            u[rows], f[rows], g[rows] = acc_u, acc_f, acc_g
+            active[rows[small_change]] = False
+
+        self.end_points = (lows + u*precisions).numpy()
+        mins = self.end_points[np.all(np.isfinite(self.end_points), axis=1) & np.isfinite(f.numpy()), :]
+
+        min_point = mins.mean(axis = 0)
+        min_error = mins.std(axis = 0)
+        return min_point, min_error
+
+    @staticmethod
+    def _two_loop(grad, s_hist, y_hist, rho, count):
+        '''
+        L-BFGS two-loop recursion for every start with its own history
+
+        Parameters:
+            grad (torch.tensor): (S, D) projected gradients
+            s_hist (torch.tensor): (S, M, D) position differences ring buffer
+            y_hist (torch.tensor): (S, M, D) gradient differences ring buffer
+            rho (torch.tensor): (S, M) inverse curvatures
+            count (torch.tensor): (S,) number of stored pairs of each start
+
+        Return:
+            r (torch.tensor): (S, D) inverse Hessian approximation times gradient
+        '''
+        num_of_starts, history, _ = s_hist.shape
+        rows = torch.arange(num_of_starts)
+        q = grad.clone()
+        alphas = torch.zeros((num_of_starts, history))
+        order = []
+        for j in range(history):
+            pos = (count - 1 - j) % history
+            valid = (j < count).float()
+            alpha = valid*rho[rows, pos]*(s_hist[rows, pos]*q).sum(axis=1)
+            q -= alpha[:, None]*y_hist[rows, pos]
+            alphas[:, j] = alpha
+            order.append((pos, valid))
+
+        newest = (count - 1) % history
+        y_new = y_hist[rows, newest]
+        gamma = (s_hist[rows, newest]*y_new).sum(axis=1)/torch.clamp((y_new*y_new).sum(axis=1), min=1e-20)
+        gamma = torch.where(count > 0, gamma, torch.ones_like(gamma))
+        r = gamma[:, None]*q
+        for j in reversed(range(history)):
+            pos, valid = order[j]
+            beta = rho[rows, pos]*(y_hist[rows, pos]*r).sum(axis=1)
+            r += valid[:, None]*s_hist[rows, pos]*(alphas[:, j] - beta)[:, None]
+        return r
@@ -1,7 +1,15 @@
 '''
 Predictor module
 '''
+import numpy as np
+
+from ..models.predict_cache import PredictCache
+from .cmaes_minimizer import CMAESMinimizer
 from .gen_minimizer import GenMinimizer
+from .grid_minimizer import GridMinimizer
+from .lbfgs_minimizer import LBFGSMinimizer
+from .refine_minimizer import RefineMinimizer
+from .reduced_space import ReducedModel, reduce_space, expand_values
 from .sgd_minimizer import SGDMinimizer
 
 class Minimizer:
@@ -16,7 +24,15 @@ class Minimizer:
             model (Predictor): Loaded model for predictions
             configs (dict): Loaded minima_configs.json file
         '''
+        self.model = model
         self.strategy = None
+        self.errors = configs['MINIMA'].get('errors', 'scan')
+        if self.errors not in ('scan', 'hesse', 'both'):
+            raise NotImplementedError(f'Errors should be "scan", "hesse" or "both"! Got {self.errors}')
+        self.hesse_result = None
+        self.cache = None
+        cache_info = configs['MINIMA'].get('cache')
+        self.cache_info = cache_info if isinstance(cache_info, dict) else ({} if cache_info else None)
 
         self.args = {
             'iters': configs['MINIMA']['iters'],
@@ -25,9 +41,25 @@ class Minimizer:
 
         if configs['MINIMA']['type'] == 'sgd':
             self.args['momentum'] = configs['MINIMA']['momentum']
+            self.args['gradient'] = configs['MINIMA'].get('gradient', 'numeric')
             self.strategy = SGDMinimizer(model)
         elif configs['MINIMA']['type'] == 'genetic':
             self.strategy = GenMinimizer(model)
+        elif configs['MINIMA']['type'] == 'lbfgs':
+            self.args['max_eval'] = configs['MINIMA'].get('max_eval', 5*self.args['iters'])
+            self.strategy = LBFGSMinimizer(model)
+        elif configs['MINIMA']['type'] == 'cmaes':
+            self.args['max_generations'] = configs['MINIMA'].get('max_generations', 1000)
+            self.strategy = CMAESMinimizer(model)
+        elif configs['MINIMA']['type'] == 'grid':
+            self.args['top_k'] = configs['MINIMA'].get('top_k', 10)
+            self.args['chunk_size'] = configs['MINIMA'].get('chunk_size', 100000)
+            self.args['workers'] = configs['MINIMA'].get('workers', 1)
+            self.strategy = GridMinimizer(model)
+        elif configs['MINIMA']['type'] == 'refine':
+            self.args['coarse_points'] = configs['MINIMA'].get('coarse_points', 5)
+            self.args['top_k'] = configs['MINIMA'].get('top_k', 10)
+            self.strategy = RefineMinimizer(model)
 
     def find_minima(self, in_space):
         '''
@@ -43,14 +75,64 @@ class Minimizer:
             neg_error (): Negative error from MINUIT
         '''
 
-        self.strategy.set_precisions(in_space['precisions'])
-        min_point, min_error = self.strategy.minimize(in_space, **self.args)
-        pos_error = self.strategy.min_error_calc(min_point, None, 1, 10000, 0.1, 100)
-        neg_error = self.strategy.min_error_calc(min_point, None, 1, 10000, -0.1, -100)
+        # Correlated features are searched as one degree of freedom
+        reduced_space, dofs = reduce_space(in_space)
+        model = self.model
+        if self.cache_info is not None:
+            self.cache = self._create_cache(reduced_space, dofs)
+            model = self.cache
+        self.strategy.model = ReducedModel(model, dofs)
+
+        self.strategy.set_precisions(reduced_space['precisions'])
+        min_point, min_error = self.strategy.minimize(reduced_space, **self.args)
+        if self.errors in ('hesse', 'both'):
+            fixed = [num for num, (_, _, points) in enumerate(reduced_space['space']) if points <= 1]
+            cov, corr, hesse_error = self.strategy.hesse(min_point, 1, fixed)
+            self.hesse_result = {
+                'covariance': cov[np.ix_(dofs, dofs)].tolist(),
+                'correlation': corr[np.ix_(dofs, dofs)].tolist(),
+                'hesse_error': [None if np.isnan(err) else err for err in expand_values(hesse_error, dofs)]
+                }
+        if self.errors in ('scan', 'both'):
+            pos_error, neg_error = self.strategy.min_error_scan(min_point, 1, 10000, 0.1, 100)
+        else:
+            pos_error, neg_error = hesse_error, hesse_error
+            if np.isnan(hesse_error).any():
+                print('NOTE: Scan errors are used for features without parabolic errors')
+                scan_pos, scan_neg = self.strategy.min_error_scan(min_point, 1, 10000, 0.1, 100)
+                pos_error = [scan if np.isnan(err) else err for err, scan in zip(hesse_error, scan_pos)]
+                neg_error = [scan if np.isnan(err) else err for err, scan in zip(hesse_error, scan_neg)]
+
+        min_point, min_error = expand_values(min_point, dofs), expand_values(min_error, dofs)
+        pos_error, neg_error = expand_values(pos_error, dofs), expand_values(neg_error, dofs)
         self._do_prints(min_point, min_error, pos_error, neg_error)
+        if self.hesse_result is not None:
+            self._print_hesse(min_point, self.hesse_result)
 
         return min_point, min_error, pos_error, neg_error
 
+    def _create_cache(self, reduced_space, dofs):
+        '''
+        Create prediction cache in front of the model. Linked features use the
+        precision of their shared degree of freedom. Numeric "sgd" gradients step
+        by 0.1 of the precision, so the cache cells are made not larger than the
+        step, otherwise all stencil points fall into one cell.
+
+        Parameters:
+            reduced_space (dict): Input space of the degrees of freedom
+            dofs (list): Degree of freedom index of each feature
+
+        Return:
+            cache (PredictCache): Prediction cache
+        '''
+        cache_info = dict(self.cache_info)
+        resolution = cache_info.pop('resolution', 1.0)
+        if self.args.get('gradient') == 'numeric' and resolution > 0.1:
+            print(f'NOTE: Prediction cache resolution {resolution} is set to 0.1 for numeric gradients')
+            resolution = 0.1
+        precisions = expand_values(reduced_space['precisions'], dofs)
+        return PredictCache(self.model, precisions, resolution=resolution, **cache_info)
+
     @staticmethod
     def _do_prints(min_point, min_error, pos_error, neg_error):
         '''
@@ -74,3 +156,20 @@ class Minimizer:
         for min_p, pos_e, neg_e in zip(min_point, pos_error, neg_error):
             print(f'{min_p:.5} + {pos_e:.5} - {neg_e:.5}')
         print('-'*len(header))
+
+    @staticmethod
+    def _print_hesse(min_point, hesse_result):
+        '''
+        Print parabolic errors and correlations
+
+        Parameters:
+            min_point (): Calculated minima
+            hesse_result (dict): Covariance, correlation and errors from HESSE
+        '''
+        print('HESSE ERROR')
+        for min_p, hesse_e in zip(min_point, hesse_result['hesse_error']):
+            print(f'{min_p:.5} +/- {hesse_e:.5}' if hesse_e is not None else f'{min_p:.5} +/- undefined')
+        print('CORRELATION')
+        for row in hesse_result['correlation']:
+            print(' '.join(f'{val:7.3f}' for val in row))
+        print('-'*19)
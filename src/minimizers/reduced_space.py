@@ -0,0 +1,77 @@
+'''
+Reduced input space for correlated features
+'''
+import numpy as np
+
+class ReducedModel:
+    '''
+    Model adapter that takes shared degrees of freedom and feeds the full
+    feature vector to the model
+    '''
+    def __init__(self, model, dofs):
+        '''
+        Init function
+
+        Parameters:
+            model (Predictor): Loaded model for predictions
+            dofs (list): Degree of freedom index of each model input feature
+        '''
+        self.model = model
+        self.dofs = list(dofs)
+
+    def predict(self, x, grad=False):
+        '''
+        Predict for points in the reduced space
+
+        Parameters:
+            x (torch.tensor): (..., R) points in the reduced space
+            grad (bool): Keep autograd graph to differentiate predictions w.r.t. x
+
+        Return:
+            y_pred (torch.tensor): Predicted values
+        '''
+        return self.model.predict(x[..., self.dofs], grad)
+
+def reduce_space(in_space):
+    '''
+    Collapse features sharing a degree of freedom into one feature. The shared
+    feature keeps the first feature name, the overlap of the grids and the
+    finest precision. Raises ValueError if the grids of a shared feature do not
+    overlap.
+
+    Parameters:
+        in_space (dict): Input space information with optional "dofs"
+
+    Return:
+        reduced_space (dict): Input space of the degrees of freedom
+        dofs (list): Degree of freedom index of each in_space feature
+    '''
+    dofs = in_space.get('dofs', list(range(len(in_space['names']))))
+    reduced_space = {'space': [], 'names': [], 'precisions': []}
+    for dof in range(max(dofs, default=-1) + 1):
+        members = [num for num, feat_dof in enumerate(dofs) if feat_dof == dof]
+        grids = np.array([in_space['space'][num] for num in members], dtype=float)
+        low, high = grids[:, 0].max(), grids[:, 1].min()
+        if low > high:
+            names = ', '.join(in_space['names'][num] for num in members)
+            raise ValueError(f'Correlated features {names} have no common grid range! \
+Intersection is [{low}, {high}].')
+        reduced_space['space'].append([low, high, int(grids[:, 2].max())])
+        reduced_space['names'].append(in_space['names'][members[0]])
+        reduced_space['precisions'].append(min(in_space['precisions'][num] for num in members))
+    return reduced_space, dofs
+
+def expand_values(values, dofs):
+    '''
+    Map degree of freedom values back to all features
+
+    Parameters:
+        values (list): Values of each degree of freedom
+        dofs (list): Degree of freedom index of each feature
+
+    Return:
+        Values of each feature
+    '''
+    if isinstance(values, np.ndarray):
+        return values[dofs]
+    return [values[dof] for dof in dofs]
@@ -0,0 +1,82 @@
+'''
+Coarse-to-fine grid minimizer module
+'''
+import itertools
+
+import torch
+import numpy as np
+from .base_minimizer import BaseMinimizer
+
+class RefineMinimizer(BaseMinimizer):
+    '''
+    Multi-resolution grid refinement minimizer
+    '''
+    def __init__(self, model):
+        '''
+        Init function
+
+        Parameters:
+            model (Predictor): Loaded model for prediction
+        '''
+        super().__init__(model)
+        self.evaluations = 0
+
+    def minimize(self, in_space, **kwargs):
+        '''
+        Minima finding algorithm. Scans a coarse grid over in_space['space'], keeps
+        the top_k best nodes and splits their cells in half around them. Features
+        whose cell size already reached the precision are not split further. Every
+        level is evaluated with one model call.
+
+        Parameters:
+            in_space (dict): Input space information
+            **kwargs (dict): Useful information. "coarse_points" nodes per feature
+                of the first level, "top_k" number of refined nodes
+
+        Return:
+            min_point (np.array): Best node
+            min_error (np.array): Spread of the top_k nodes of the last level
+        '''
+        coarse_points = max(kwargs.get('coarse_points', 5), 2)
+        top_k = kwargs.get('top_k', 10)
+
+        space = np.array(in_space['space'], dtype=float).reshape((-1, 3))
+        lows, highs = space[:, 0], space[:, 1]
+        precisions = np.array(self.precisions, dtype=float)
+        cells = (highs - lows)/(coarse_points - 1)
+
+        axes = [np.linspace(low, high, coarse_points) for low, high in zip(lows, highs)]
+        points = np.array(list(itertools.product(*axes))).reshape((-1, len(lows)))
+        self.evaluations = 0
+        while True:
+            chi2 = self._evaluate(points)
+            best = np.argsort(chi2)[:top_k]
+            points = points[best]
+            if np.all(cells <= precisions):
+                break
+
+            split = cells > precisions
+            cells = np.where(split, cells/2, cells)
+            offsets = [[-cell, 0, cell] if do_split else [0] for cell, do_split in zip(cells, split)]
+            offsets = np.array(list(itertools.product(*offsets)))
+            points = (points[:, None, :] + offsets[None, :, :]).reshape((-1, len(lows)))
+            points = np.unique(np.clip(points, lows, highs), axis=0)
+
+        min_point = points[0]
+        min_error = points.std(axis=0)
+        return min_point, min_error
+
+    def _evaluate(self, points):
+        '''
+        Summed chi2 of the points with one model call
+
+        Parameters:
+            points (np.array): (N, D) points
+
+        Return:
+            chi2 (np.array): (N,) summed chi2
+        '''
+        self.evaluations += len(points)
+        with torch.no_grad():
+            chi2 = self.model.predict(torch.tensor(points, dtype=torch.float)).sum(axis=1)
+        return chi2.numpy()
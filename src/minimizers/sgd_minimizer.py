@@ -33,61 +33,68 @@ class SGDMinimizer(BaseMinimizer):
         '''
         start_points = self.get_start_points(in_space, kwargs['number_of_samples'])
 
-        mins = []
-        for point in tqdm(start_points):
-            min_point = self.sgd_momentum(point, **kwargs)
-            mins.append(min_point.numpy())
-        mins = np.array(mins)
+        mins = self.sgd_momentum(start_points, in_space, **kwargs).numpy()
         mins = mins[np.any(~np.isnan(mins), axis=1), :]
 
         min_point = mins.mean(axis = 0)
         min_error = mins.std(axis = 0)
         return min_point, min_error
 
-    def sgd_momentum(self, start_pos, **kwargs):
+    def sgd_momentum(self, start_pos, in_space, **kwargs):
         '''
-        Minimiz with stochastic gradient descent with momentum
+        Minimize with stochastic gradient descent with momentum. All starting
+        points move together as one (S, D) tensor.
 
         Parameters:
-            start_pos (list): Minimization starting point
+            start_pos (np.array): (S, D) minimization starting points
+            in_space (dict): Input space information
 
         Return:
-            x (torch.tensor): Minimial point
-            positions (list): List of point sgd moved during minimization
+            x (torch.tensor): (S, D) minimal points
         '''
-        grad_args = {}
         x = torch.tensor(start_pos, dtype=torch.float)
         v = torch.zeros_like(x)
         lr = 0.01*torch.tensor(self.precisions, dtype=torch.float)
         steps = 0.1*torch.tensor(self.precisions, dtype=torch.float)
+        lows, highs = self.get_bounds(in_space)
+        active = torch.ones(len(x), dtype=torch.bool)
 
-        with torch.no_grad():
-            for _ in range(kwargs['iters']):
-                grad_args = {'step': steps}
-                grad = self._grad_calc(x, **grad_args)
-                if (grad**2).sum() < 1e-5:
-                    break
-
-                v = kwargs['momentum'] * v + (1 - kwargs['momentum'])*grad
-                x = x - lr * v
+        for _ in tqdm(range(kwargs['iters'])):
+            grad = self._grad_calc(x[active], step=steps, gradient=kwargs.get('gradient', 'numeric'))
+            converged = (grad**2).sum(axis=1) < 1e-5
+            active_idx = torch.nonzero(active).flatten()
+            active[active_idx[converged]] = False
+            if not active.any():
+                break
+
+            grad = grad[~converged]
+            active_idx = active_idx[~converged]
+            v[active_idx] = kwargs['momentum'] * v[active_idx] + (1 - kwargs['momentum'])*grad
+            x[active_idx] = torch.clamp(x[active_idx] - lr * v[active_idx], lows, highs)
         return x
 
-    def _grad_calc(self, point, **kwargs):
+    def _grad_calc(self, points, **kwargs):
         '''
-        Gradient calculation method at point
+        Gradient calculation method at points
 
         Parameters:
-            point (np.array): Gradient calculation point
-            **kwargs (dict): Useful information
+            points (torch.tensor): (S, D) gradient calculation points
+            **kwargs (dict): Useful information. "gradient" is either "numeric" for
+                forward finite differences or "autograd" for exact gradients
 
         Return:
-            grad (list): Gradient at provieded point
+            grad (torch.tensor): (S, D) gradients at provided points
         '''
-        grad = torch.zeros_like(point)
-        for i in range(point.size()[0]):
-            point_step = point.clone()
-            point_step[i] += kwargs['step'][i]
-            y_init = self.model.predict(point).sum()
-            y_step = self.model.predict(point_step).sum()
-            grad[i] = (y_step - y_init) / kwargs['step'][i]
+        if kwargs['gradient'] == 'autograd':
+            points = points.clone().requires_grad_(True)
+            y_pred = self.model.predict(points, grad=True).sum()
+            grad = torch.autograd.grad(y_pred, points)[0]
+            return grad.detach()
+
+        num_of_points, dim = points.shape
+        shifts = torch.vstack((torch.zeros((1, dim)), torch.diag(kwargs['step'])))
+        points_step = (points.unsqueeze(1) + shifts).reshape((-1, dim))
+        with torch.no_grad():
+            y_pred = self.model.predict(points_step).sum(axis=1).reshape((num_of_points, dim + 1))
+        grad = (y_pred[:, 1:] - y_pred[:, :1]) / kwargs['step']
         return grad
@@ -2,5 +2,6 @@
 Another __init__.py
 '''
 from .rich_alignment_model import RICHAlignmentModel
+from .predict_cache import PredictCache
 
-__all__ = ['RICHAlignmentModel']
+__all__ = ['RICHAlignmentModel', 'PredictCache']
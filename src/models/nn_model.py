@@ -1,13 +1,12 @@
 '''
 NN model
 '''
+import hashlib
 import json
-from copy import deepcopy
 import torch
 from pathlib import Path
 from .base_model import BaseModel
 from .nets import fcn
-from torch.utils.data import Dataset, DataLoader
 
 class NNModel(BaseModel):
     '''
@@ -37,12 +36,17 @@ class NNModel(BaseModel):
         optimizer = torch.optim.SGD(self.model.parameters(), lr=lr, momentum=momentum)
 
         #optimizer = torch.optim.Adam(self.model.parameters(), lr=lr)
+        scheduler = self._create_scheduler(optimizer, train_info)
         running_loss = 0
-        best_model = None
+        best_state = None
         best_loss = 1e10
-        verbose = 1000
+        verbose = train_info.get('val_interval', 1000)
 
-        x_train, x_val, y_train, y_val = data_reader.get_data(val_size=train_info['val_size'],norm=False)
+        early_stopping = train_info.get('early_stopping')
+        bad_checks = 0
+
+        x_train, x_val, y_train, y_val = data_reader.get_data(train_info['batch_size'], \
+train_info['val_size'], norm=False, shuffle=train_info['shuffle'])
 
         x_train_mean = x_train.mean(axis=0)
         y_train_mean = y_train.mean(axis=0)
@@ -66,47 +70,65 @@ class NNModel(BaseModel):
         print(x_train.shape)
         print(y_train.shape)
 
-#        train_loader, val_loader, self.norm_params = \
-#data_reader.get_data(train_info['batch_size'], train_info['val_size'], train_info['norm'])
-
         self.model = self.model.to(self.device)
-        batch_size = data_reader.batch_size
-        num_of_batches = data_reader.num_of_batches
 
-#        train_loader = DataLoader(list(zip(x_train,y_train)), shuffle=True, batch_size=batch_size)
+        full_batch = train_info.get('batch_mode', 'full') == 'full'
+        batch_size = len(x_train) if full_batch else min(data_reader.batch_size, len(x_train))
+        num_of_batches = 1 if full_batch else data_reader.num_of_batches
+        shuffle = train_info['shuffle'] and not full_batch
+
+        perm = torch.arange(len(x_train), device=self.device)
+        x_batch = torch.empty((batch_size, x_train.shape[1]), device=self.device)
+        y_batch = torch.empty((batch_size, y_train.shape[1]), device=self.device)
 
         for i in range(train_info['epochs']):
-            optimizer.zero_grad()
-            y_pred = self.model(x_train)
-            loss_v = loss_fn(y_pred, y_train)
-            loss_v.backward()
-            optimizer.step()
-            running_loss += float(loss_v)
-
-#            for _ in range(num_of_batches):
-#                x_train, y_train = next(iter(train_loader))
-#                optimizer.zero_grad()
-#                y_pred = self.model(x_train)
-#                loss_v = loss_fn(y_pred, y_train)
-#                loss_v.backward()
-#                optimizer.step()
-#                running_loss += float(loss_v)
+            if full_batch:
+                optimizer.zero_grad()
+                y_pred = self.model(x_train)
+                loss_v = loss_fn(y_pred, y_train)
+                loss_v.backward()
+                optimizer.step()
+                running_loss += float(loss_v)
+            else:
+                if shuffle:
+                    torch.randperm(len(x_train), out=perm)
+                for j in range(num_of_batches):
+                    idx = perm[j*batch_size:(j+1)*batch_size]
+                    x_b = torch.index_select(x_train, 0, idx, out=x_batch[:len(idx)])
+                    y_b = torch.index_select(y_train, 0, idx, out=y_batch[:len(idx)])
+                    optimizer.zero_grad()
+                    y_pred = self.model(x_b)
+                    loss_v = loss_fn(y_pred, y_b)
+                    loss_v.backward()
+                    optimizer.step()
+                    running_loss += float(loss_v)
+
+            if isinstance(scheduler, torch.optim.lr_scheduler.CosineAnnealingLR):
+                scheduler.step()
 
             if (i+1) % verbose == 0:
                 with torch.no_grad():
                     y_pred = self.model(x_val)
                     loss_v = loss_fn(y_pred, y_val)
                     val_loss = float(loss_v)
+                if isinstance(scheduler, torch.optim.lr_scheduler.ReduceLROnPlateau):
+                    scheduler.step(val_loss)
+
+                if early_stopping and val_loss < best_loss - early_stopping.get('min_delta', 0):
+                    bad_checks = 0
+                elif early_stopping:
+                    bad_checks += 1
                 if val_loss < best_loss:
-                    best_model = deepcopy(self.model)
+                    best_state = {k: v.detach().clone() for k, v in self.model.state_dict().items()}
                     best_loss = val_loss
 
+                train_loss = running_loss/verbose/num_of_batches
                 print('*'*20)
                 print(f"[TRAINING] Epoch {i+1}/{train_info['epochs']}")
-                print(f'[TRAINING] train loss: {running_loss/verbose:.5f}')
+                print(f'[TRAINING] train loss: {train_loss:.5f}')
                 print(f'[TRAINING] val loss: {val_loss:.5f}')
                 print('*'*20)
-                self.loss_hist['train_loss'].append(running_loss/verbose/num_of_batches)
+                self.loss_hist['train_loss'].append(train_loss)
                 self.loss_hist['val_loss'].append(val_loss)
                 self.loss_hist['epochs'].append(i+1)
 
@@ -116,21 +138,51 @@ class NNModel(BaseModel):
 #                    self.save_model(output_dir)
                 running_loss = 0
 
-        if best_model is not None:
-            self.model = best_model
+                if early_stopping and bad_checks >= early_stopping['patience']:
+                    print(f'[TRAINING] Early stopping at epoch {i+1}')
+                    break
+
+        if best_state is not None:
+            self.model.load_state_dict(best_state)
+
+    @staticmethod
+    def _create_scheduler(optimizer, train_info):
+        '''
+        Create learning rate scheduler from TRAINING section
+
+        Parameters:
+            optimizer: Model optimizer
+            train_info: Training metadata
 
-    def predict(self, x: torch.tensor) -> torch.tensor:
+        Return:
+            scheduler: Learning rate scheduler or None
+        '''
+        scheduler_info = train_info.get('scheduler')
+        if not scheduler_info:
+            return None
+        if scheduler_info['type'] == 'plateau':
+            return torch.optim.lr_scheduler.ReduceLROnPlateau(optimizer, \
+factor=scheduler_info.get('factor', 0.1), patience=scheduler_info.get('patience', 10), \
+min_lr=scheduler_info.get('min_lr', 0))
+        if scheduler_info['type'] == 'cosine':
+            return torch.optim.lr_scheduler.CosineAnnealingLR(optimizer, \
+T_max=scheduler_info.get('t_max', train_info['epochs']), eta_min=scheduler_info.get('min_lr', 0))
+        raise NotImplementedError(f'Scheduler {scheduler_info["type"]} is not implemented! \
+Use either "plateau" or "cosine".')
+
+    def predict(self, x: torch.tensor, grad=False) -> torch.tensor:
         '''
         Predict value for the given points
 
         Parameters:
             x: Points for prediction
+            grad: Keep autograd graph to differentiate predictions w.r.t. x
 
         Return:
             y_pred: Predicted values
         '''
         x = (x - self.norm_params['x_mean'])/self.norm_params['x_std']
-        with torch.no_grad():
+        with torch.set_grad_enabled(grad):
             y_pred = self.model.to('cpu')(x)
         y_pred = y_pred * self.norm_params['y_std'] + self.norm_params['y_mean']
         return y_pred
@@ -169,6 +221,19 @@ class NNModel(BaseModel):
         }
         return res
 
+    def weights_hash(self) -> str:
+        '''
+        Hash of the model weights and normalization parameters
+
+        Return:
+            Hex digest
+        '''
+        hasher = hashlib.sha1()
+        for name, tensor in list(self.model.state_dict().items()) + list(self.norm_params.items()):
+            hasher.update(name.encode('utf8'))
+            hasher.update(torch.as_tensor(tensor).detach().cpu().contiguous().numpy().tobytes())
+        return hasher.hexdigest()
+
     def load_model(self, model_path, norm_path):
         '''
         Load model from the path
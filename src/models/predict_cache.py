@@ -0,0 +1,83 @@
+'''
+Memoization of model predictions on the precision grid
+'''
+from collections import OrderedDict
+
+import torch
+
+class PredictCache():
+    '''
+    Bounded LRU cache in front of model predict. Points are quantized to the
+    precision grid and every cell is predicted once at its center.
+    '''
+    def __init__(self, model, precisions, max_size=100000, resolution=1.0):
+        '''
+        Init method
+
+        Parameters:
+            model: Model with predict(x, grad) method
+            precisions: Precision of each input feature
+            max_size: Max number of cached cells, least recently used are evicted
+            resolution: Cell size relative to the precisions
+        '''
+        self.model = model
+        self.steps = torch.tensor(precisions, dtype=torch.float)*resolution
+        self.max_size = max_size
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def predict(self, x, grad=False):
+        '''
+        Predict for provided points. Gradient requests bypass the cache.
+
+        Parameters:
+            x: Provided points
+            grad: Keep autograd graph to differentiate predictions w.r.t. x
+
+        Return:
+            y_pred: Predicted values
+        '''
+        if grad:
+            return self.model.predict(x, grad)
+
+        shape = x.shape
+        if x.numel() == 0:
+            return self.model.predict(x, False)
+        cells = torch.round(x.detach().reshape((-1, shape[-1]))/self.steps).to(torch.int64)
+        keys = [tuple(row) for row in cells.tolist()]
+
+        results = [None]*len(keys)
+        missing = OrderedDict()
+        for num, key in enumerate(keys):
+            if key in missing:
+                missing[key].append(num)
+            elif key in self.cache:
+                self.cache.move_to_end(key)
+                results[num] = self.cache[key]
+            else:
+                missing[key] = [num]
+        self.misses += len(missing)
+        self.hits += len(keys) - len(missing)
+
+        if len(missing) != 0:
+            centers = torch.tensor(list(missing), dtype=torch.float)*self.steps
+            y_pred = self.model.predict(centers, False).detach()
+            for key, row in zip(missing, y_pred):
+                row = row.clone()
+                for num in missing[key]:
+                    results[num] = row
+                self.cache[key] = row
+            while len(self.cache) > self.max_size:
+                self.cache.popitem(last=False)
+
+        return torch.stack(results).reshape(shape[:-1] + (-1,))
+
+    def info(self):
+        '''
+        Cache statistics
+
+        Return:
+            Hits, misses and the number of cached cells
+        '''
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.cache)}
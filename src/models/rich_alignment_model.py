@@ -36,19 +36,29 @@ class RICHAlignmentModel():
         res = self.model.save_model(output_path)
         return res
 
-    def predict(self, x):
+    def predict(self, x, grad=False):
         '''
         Predict for provided points
 
         Parameters:
             x: Provided points
+            grad: Keep autograd graph to differentiate predictions w.r.t. x
 
         Return:
             y_pred: Predicted values
         '''
-        y_pred = self.model.predict(x)
+        y_pred = self.model.predict(x, grad)
         return y_pred
 
+    def weights_hash(self):
+        '''
+        Hash of the model weights
+
+        Return:
+            Hex digest
+        '''
+        return self.model.weights_hash()
+
     def load_model(self, model_path, norm_path):
         '''
         Load model and normalization parameters
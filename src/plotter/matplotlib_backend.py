@@ -0,0 +1,97 @@
+'''
+Matplotlib plotting backend
+'''
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+# pylint: disable=wrong-import-position
+from matplotlib import pyplot as plt
+from matplotlib.backends.backend_pdf import PdfPages
+
+def render_maps(output_path, items, workers=1): # pylint: disable=unused-argument
+    '''
+    Write 2D maps into one multi-page PDF file
+
+    Parameters:
+        output_path: PDF file path
+        items: (label, chi2, axis1_bins, axis2_bins, graph_points) of each map
+        workers: Ignored, all pages are written into one file
+    '''
+    with PdfPages(output_path) as pdf:
+        for label, chi2, axis1_bins, axis2_bins, points in items:
+            title, x_title, y_title = label.split(';')
+            fig, ax = plt.subplots(figsize=(8, 6))
+            mesh = ax.pcolormesh(axis1_bins, axis2_bins, np.asarray(chi2).T, shading='nearest')
+            fig.colorbar(mesh, ax=ax)
+            ax.errorbar(points['x'], points['y'], xerr=points['ex'], yerr=points['ey'], \
+fmt='*', color='red')
+            ax.errorbar(points['x'], points['y'], xerr=[[points['exl']], [points['exh']]], \
+yerr=[[points['eyl']], [points['eyh']]], fmt='s', color='magenta')
+            ax.set_title(title)
+            ax.set_xlabel(x_title)
+            ax.set_ylabel(y_title)
+            pdf.savefig(fig)
+            plt.close(fig)
+
+def render_profiles(output_path, items):
+    '''
+    Write 1D chi2 profiles into one multi-page PDF file
+
+    Parameters:
+        output_path: PDF file path
+        items: (name, axis_bins, chi2, min_point) of each profile
+    '''
+    with PdfPages(output_path) as pdf:
+        for name, axis_bins, chi2, points in items:
+            fig, ax = plt.subplots(figsize=(8, 6))
+            ax.plot(axis_bins, chi2)
+            ax.axvline(points['x'], color='magenta')
+            ax.axvspan(points['x'] - points['exl'], points['x'] + points['exh'], color='magenta', alpha=0.2)
+            ax.set_title(name)
+            ax.set_xlabel(name)
+            ax.set_ylabel('chi2')
+            pdf.savefig(fig)
+            plt.close(fig)
+
+def draw_losses(output_path, epochs, train, test):
+    '''
+    Draw training and validation loss history
+
+    Parameters:
+        output_path: Output figure path
+        epochs: Epochs of the loss values
+        train: Training loss values
+        test: Validation loss values
+    '''
+    if len(epochs) < 1:
+        return
+    fig, ax = plt.subplots(figsize=(8, 6))
+    ax.plot(epochs, train, label='train history')
+    ax.plot(epochs, test, color='red', label='val history')
+    ax.set_yscale('log')
+    ax.set_title('Training vs Validation history')
+    ax.set_xlabel('Epochs')
+    ax.set_ylabel('Average RMS/points')
+    ax.legend()
+    fig.savefig(output_path)
+    plt.close(fig)
+
+def draw_diff(output_path, abs_diff, rel_diff):
+    '''
+    Draw absoulute and relative differences
+
+    Parameters:
+        output_path: Output path to save figure
+        abs_diff: Absolute differences of averaged chi2
+        rel_diff: Relative differences of averaged chi2
+    '''
+    fig, ax = plt.subplots(figsize=(8, 6))
+    bins = np.linspace(-0.5, 0.5, 401)
+    ax.hist(abs_diff, bins=bins, histtype='step', label='absolute')
+    ax.hist(rel_diff, bins=bins, histtype='step', color='red', label='relative')
+    ax.set_title('Model vs data')
+    ax.set_xlabel('(chi2_average_pred - chi2_average_real)')
+    ax.set_ylabel('count')
+    ax.legend()
+    fig.savefig(output_path)
+    plt.close(fig)
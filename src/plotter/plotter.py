@@ -1,31 +1,34 @@
 '''
-CERN ROOT plotter
+Plotter of training and minimization results
 '''
-# To skip ROOT pylint errors
-#pylint: disable=E1101
-
+import hashlib
+import importlib
 import json
+import os
 from itertools import combinations
-from tqdm import tqdm
+from pathlib import Path
 import torch
-import ROOT
 import numpy as np
 
-ROOT.gROOT.SetBatch(True)
-ROOT.gStyle.SetOptStat(False)
-
 class Plotter:
     '''
     Plotter class
     '''
-    def __init__(self, model):
+    backends = ('root', 'matplotlib')
+
+    def __init__(self, model, backend='root'):
         '''
         Init method
 
         Parameters:
             model: Model for plots
+            backend: Either "root" or "matplotlib"
         '''
+        if backend not in self.backends:
+            raise ValueError(f'Plotter backend should be one of {self.backends}!')
         self.model = model
+        self.backend = backend
+        self.cache_dir = None
         self.in_space = None
         self.out_space = None
         self.min_point = None
@@ -33,6 +36,17 @@ class Plotter:
         self.neg_error = None
         self.pos_error = None
 
+    def set_cache(self, cache_dir):
+        '''
+        Keep predicted pair grids in the directory. A grid is found by the model
+        weights hash, its axes and min_point without the pair coordinates, so
+        only grids affected by a moved min_point are predicted again.
+
+        Parameters:
+            cache_dir: Cache directory path or None to disable the cache
+        '''
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+
     def setup_prediction_plotter(self, in_space, out_space, res):
         '''
         Pass input and output spaces for plots
@@ -49,116 +63,387 @@ class Plotter:
         self.neg_error = np.array(res['neg_error'])
         self.pos_error = np.array(res['pos_error'])
 
-    def create_root_tree(self, output_path):
+    def create_maps(self, output_dir, chunk_size=1000000, channels=False, workers=1):
         '''
-        Create ROOT file
+        Create 2D maps of all input pairs with the selected backend. Grids and
+        predictions are also saved in "maps.npz" to render them again without
+        the model.
 
         Parameters:
-            output_path: ROOT file full path
+            output_dir: Output directory, maps are saved in "plots.root" or "plots.pdf"
+            chunk_size: Max number of points in one model call
+            channels: If True maps of every output are written besides "total"
+            workers: Number of processes to render ROOT maps
+
+        Return:
+            maps_path: Saved maps file path
+        '''
+        output_dir = Path(output_dir)
+        combs = self.get_pairs()
+        grids = self.predict_pairs(combs, chunk_size)
+        self.save_maps(output_dir/'maps.npz', combs, grids)
+        return self._render_maps(output_dir, combs, grids, channels, workers)
+
+    def create_profiles(self, output_dir, chunk_size=1000000):
+        '''
+        Create 1D chi2 profile of each input feature across its grid with the
+        other features fixed at min_point. Profiles are also saved in
+        "profiles.npz".
+
+        Parameters:
+            output_dir: Output directory, profiles are saved in "profiles.root"
+                or "profiles.pdf"
+            chunk_size: Max number of points in one model call
+
+        Return:
+            profiles_path: Rendered profiles file path or None if backend is not installed
+        '''
+        output_dir = Path(output_dir)
+        features, profiles = self.predict_profiles(chunk_size)
+
+        arrays = {'features': np.array(features, dtype=int), 'input_names': np.array(self.in_space['names'])}
+        for num, (axis_bins, Y) in enumerate(profiles):
+            arrays[f'axis_{num}'] = axis_bins
+            arrays[f'values_{num}'] = Y
+        np.savez(output_dir/'profiles.npz', **arrays)
+
+        backend = self._get_backend()
+        if backend is None:
+            return None
+        items = []
+        for feature, (axis_bins, Y) in zip(features, profiles):
+            points = {
+                'x': float(self.min_point[feature]),
+                'exl': float(self.neg_error[feature]),
+                'exh': float(self.pos_error[feature])
+                }
+            items.append((self.in_space['names'][feature], axis_bins, Y.sum(axis=1), points))
+        profiles_path = output_dir / ('profiles.root' if self.backend == 'root' else 'profiles.pdf')
+        backend.render_profiles(profiles_path, items)
+        return profiles_path
+
+    def predict_profiles(self, chunk_size=1000000):
         '''
-        root_file = ROOT.TFile.Open(str(output_path), 'RECREATE')
+        Predict 1D scans of all features around min_point as one stacked batch
+
+        Parameters:
+            chunk_size: Max number of points in one model call
 
+        Return:
+            features: Scanned feature indexes, charge is skipped
+            profiles: (axis_bins, Y) for each feature, Y has (len(axis_bins), outputs) shape
+        '''
         N = len(self.min_point)
         if self.in_space['names'][-1] == 'charge':
             N -= 1
-        combs = list(combinations(list(range(N)), 2))
-        for comb in tqdm(combs):
-            axis1 = self.in_space['space'][comb[0]]
-            axis2 = self.in_space['space'][comb[1]]
-            X = np.tile(self.min_point, axis1[2]*axis2[2]).reshape((axis1[2]*axis2[2],len(self.min_point)))
-            axis1_bins = np.linspace(axis1[0],axis1[1],axis1[2])
-            axis1_vals = np.repeat(np.linspace(axis1[0],axis1[1],axis1[2]),axis2[2])
-            axis2_bins = np.linspace(axis2[0],axis2[1],axis2[2])
-            axis2_vals = np.tile(np.linspace(axis2[0],axis2[1],axis2[2]),axis1[2])
-            X[:, comb[0]] = axis1_vals
-            X[:, comb[1]] = axis2_vals
-            X = torch.tensor(X, dtype=torch.float)
-            Y = self.model.predict(X)
-            Y = Y.detach().numpy()
-            Y = np.hstack((Y, Y.sum(axis=1).reshape(len(Y),1)))
+        features = list(range(N))
+        axes = [np.linspace(*self.in_space['space'][num]) for num in features]
+        sizes = [len(axis_bins) for axis_bins in axes]
+
+        X = np.tile(self.min_point, (sum(sizes), 1))
+        offset = 0
+        for feature, axis_bins in zip(features, axes):
+            X[offset:offset + len(axis_bins), feature] = axis_bins
+            offset += len(axis_bins)
+
+        Y = self._predict_chunks(X, chunk_size)
+        profiles = list(zip(axes, np.split(Y, np.cumsum(sizes)[:-1])))
+        return features, profiles
+
+    def create_root_tree(self, output_path, chunk_size=1000000, channels=False, workers=1):
+        '''
+        Create ROOT file
+
+        Parameters:
+            output_path: ROOT file full path
+            chunk_size: Max number of points in one model call
+            channels: If True maps of every output are written besides "total"
+            workers: Number of processes to render maps. Each process writes its
+                own ROOT file and the files are merged into output_path.
+        '''
+        combs = self.get_pairs()
+        grids = self.predict_pairs(combs, chunk_size)
+        items = self._map_items(combs, grids, channels)
+        self._get_backend('root').render_maps(Path(output_path), items, workers)
+
+    def render_saved_maps(self, maps_path, output_dir, channels=False, workers=1):
+        '''
+        Render maps saved by create_maps without the model
+
+        Parameters:
+            maps_path: Saved "maps.npz" path
+            output_dir: Output directory
+            channels: If True maps of every output are written besides "total"
+            workers: Number of processes to render ROOT maps
+
+        Return:
+            maps_path: Rendered maps file path
+        '''
+        combs, grids = self.load_maps(maps_path)
+        return self._render_maps(Path(output_dir), combs, grids, channels, workers)
+
+    def save_maps(self, maps_path, combs, grids):
+        '''
+        Save pair grids and predictions
+
+        Parameters:
+            maps_path: Output ".npz" path
+            combs: List of index pairs
+            grids: (axis1_bins, axis2_bins, Y) for each pair
+        '''
+        arrays = {
+            'pairs': np.array(combs, dtype=int).reshape((-1, 2)),
+            'input_names': np.array(self.in_space['names']),
+            'output_names': np.array(self.out_space['names']),
+            'min_point': self.min_point,
+            'stat_error': self.stat_error,
+            'neg_error': self.neg_error,
+            'pos_error': self.pos_error
+            }
+        for num, (axis1_bins, axis2_bins, Y) in enumerate(grids):
+            arrays[f'axis1_{num}'] = axis1_bins
+            arrays[f'axis2_{num}'] = axis2_bins
+            arrays[f'values_{num}'] = Y
+        np.savez(maps_path, **arrays)
+
+    def load_maps(self, maps_path):
+        '''
+        Load pair grids and predictions, plotter spaces and results are set
+        from the file
+
+        Parameters:
+            maps_path: Saved ".npz" path
+
+        Return:
+            combs: List of index pairs
+            grids: (axis1_bins, axis2_bins, Y) for each pair
+        '''
+        with np.load(maps_path) as arrays:
+            self.in_space = {'names': arrays['input_names'].tolist()}
+            self.out_space = {'names': arrays['output_names'].tolist()}
+            self.min_point = arrays['min_point']
+            self.stat_error = arrays['stat_error']
+            self.neg_error = arrays['neg_error']
+            self.pos_error = arrays['pos_error']
+            combs = [tuple(comb) for comb in arrays['pairs'].tolist()]
+            grids = [(arrays[f'axis1_{num}'], arrays[f'axis2_{num}'], arrays[f'values_{num}']) \
+for num in range(len(combs))]
+        return combs, grids
+
+    def _render_maps(self, output_dir, combs, grids, channels, workers):
+        '''
+        Render pair grids with the selected backend
+
+        Parameters:
+            output_dir: Output directory
+            combs: List of index pairs
+            grids: (axis1_bins, axis2_bins, Y) for each pair
+            channels: If True maps of every output are written besides "total"
+            workers: Number of processes to render ROOT maps
+
+        Return:
+            maps_path: Rendered maps file path or None if backend is not installed
+        '''
+        maps_path = output_dir / ('plots.root' if self.backend == 'root' else 'plots.pdf')
+        backend = self._get_backend()
+        if backend is None:
+            return None
+        backend.render_maps(maps_path, self._map_items(combs, grids, channels), workers)
+        return maps_path
+
+    def _map_items(self, combs, grids, channels):
+        '''
+        Collect maps to render
+
+        Parameters:
+            combs: List of index pairs
+            grids: (axis1_bins, axis2_bins, Y) for each pair
+            channels: If True maps of every output are added besides "total"
+
+        Return:
+            items: (label, chi2, axis1_bins, axis2_bins, graph_points) of each map
+        '''
+        items = []
+        for comb, (axis1_bins, axis2_bins, Y) in zip(combs, grids):
             comb = list(comb)
-            g1, g2 = self._create_root_tgraph(comb)
-            for i in range(Y.shape[1]):
-                hist_name = None
-                if i == (Y.shape[1]-1):
-                    hist_name = 'total'
-                else:
-                    hist_name = self.out_space['names'][i]
-                    continue        
+            hist_names = list(self.out_space['names'][:Y.shape[2]]) if channels else []
+            values = [Y[:, :, i] for i in range(len(hist_names))] + [Y.sum(axis=2)]
+            graph_points = self._graph_points(comb)
+            for hist_name, chi2 in zip(hist_names + ['total'], values):
                 label = f"{hist_name};{self.in_space['names'][comb[0]]};{self.in_space['names'][comb[1]]}"
-                canv_name = '_'.join(label.split(';'))
-                canv = ROOT.TCanvas(canv_name, canv_name, 800, 600)
-                hist = self._create_root_hist(Y[:, i], X[:, list(comb)], axis1_bins, axis2_bins, label)
-                hist.Draw('colz')
-                g1.Draw('*')
-                g2.Draw('same')
-                canv.Write()
-        root_file.Close()
+                items.append((label, chi2, axis1_bins, axis2_bins, graph_points))
+        return items
+
+    def _get_backend(self, backend=None):
+        '''
+        Import plotting backend module
+
+        Parameters:
+            backend: Backend name, plotter backend by default
+
+        Return:
+            Backend module or None if matplotlib is not installed
+        '''
+        backend = backend or self.backend
+        try:
+            return importlib.import_module(f'.{backend}_backend', __package__)
+        except ImportError as error:
+            if backend == 'root':
+                raise
+            print(f'WARNING: {backend} cannot be imported, only arrays are saved! {error!r}')
+            return None
+
+    def get_pairs(self):
+        '''
+        Pairs of input feature indexes for 2D maps, charge is skipped
+
+        Return:
+            combs: List of index pairs
+        '''
+        N = len(self.min_point)
+        if self.in_space['names'][-1] == 'charge':
+            N -= 1
+        return list(combinations(list(range(N)), 2))
+
+    def predict_pairs(self, combs, chunk_size=1000000):
+        '''
+        Predict 2D grids of all pairs around min_point. The grids of all pairs are
+        stacked and predicted in chunks of chunk_size points. Grids found in the
+        cache are not predicted.
+
+        Parameters:
+            combs: List of index pairs
+            chunk_size: Max number of points in one model call
+
+        Return:
+            grids: (axis1_bins, axis2_bins, Y) for each pair, Y has
+                (len(axis1_bins), len(axis2_bins), outputs) shape
+        '''
+        axes = [np.linspace(axis[0], axis[1], axis[2]) for axis in self.in_space['space']]
+        keys = self._grid_keys(combs)
+        cached = [self._load_grid(key) for key in keys]
+        missing = [num for num, Y in enumerate(cached) if Y is None]
 
-    def _create_root_tgraph(self, comb):
+        sizes = [len(axes[combs[num][0]])*len(axes[combs[num][1]]) for num in missing]
+        X = np.tile(self.min_point, (sum(sizes), 1))
+        offset = 0
+        for num, size in zip(missing, sizes):
+            comb = combs[num]
+            axis1_bins, axis2_bins = axes[comb[0]], axes[comb[1]]
+            X[offset:offset + size, comb[0]] = np.repeat(axis1_bins, len(axis2_bins))
+            X[offset:offset + size, comb[1]] = np.tile(axis2_bins, len(axis1_bins))
+            offset += size
+
+        Y = self._predict_chunks(X, chunk_size)
+        for num, Y_pair in zip(missing, np.split(Y, np.cumsum(sizes)[:-1])):
+            comb = combs[num]
+            cached[num] = Y_pair.reshape((len(axes[comb[0]]), len(axes[comb[1]]), -1))
+            self._save_grid(keys[num], cached[num])
+
+        return [(axes[comb[0]], axes[comb[1]], Y_pair) for comb, Y_pair in zip(combs, cached)]
+
+    def _grid_keys(self, combs):
         '''
-        Create two TGraphs one is for statistics errors, second MINUIT errors
+        Content keys of the pair grids
+
+        Parameters:
+            combs: List of index pairs
+
+        Return:
+            keys: Hex digest for each pair or None if the cache is disabled
+        '''
+        weights_hash = getattr(self.model, 'weights_hash', None)
+        if self.cache_dir is None or weights_hash is None:
+            return [None]*len(combs)
+        weights_hash = weights_hash()
+
+        keys = []
+        for comb in combs:
+            base_point = np.array(self.min_point, dtype=float)
+            base_point[list(comb)] = np.nan
+            payload = {
+                'model': weights_hash,
+                'pair': list(comb),
+                'axes': [list(map(float, self.in_space['space'][num])) for num in comb],
+                'base_point': base_point.tolist()
+                }
+            payload = json.dumps(payload, sort_keys=True)
+            keys.append(hashlib.sha1(payload.encode('utf8')).hexdigest())
+        return keys
+
+    def _load_grid(self, key):
+        '''
+        Load cached grid predictions
+
+        Parameters:
+            key: Grid key
+
+        Return:
+            Y: Cached predictions or None
+        '''
+        if key is None or not (self.cache_dir / f'{key}.npy').exists():
+            return None
+        return np.load(self.cache_dir / f'{key}.npy')
+
+    def _save_grid(self, key, Y):
+        '''
+        Save grid predictions into the cache
+
+        Parameters:
+            key: Grid key
+            Y: Grid predictions
+        '''
+        if key is None:
+            return
+        self.cache_dir.mkdir(exist_ok=True, parents=True)
+        tmp_path = self.cache_dir / f'{key}.npy.tmp'
+        with open(tmp_path, 'wb') as file_writer:
+            np.save(file_writer, Y)
+        os.replace(tmp_path, self.cache_dir / f'{key}.npy')
+
+    def _predict_chunks(self, X, chunk_size):
+        '''
+        Predict points in chunks
+
+        Parameters:
+            X: (N, D) points
+            chunk_size: Max number of points in one model call
+
+        Return:
+            Y: (N, outputs) predictions
+        '''
+        Y = []
+        with torch.no_grad():
+            for start in range(0, len(X), chunk_size):
+                X_chunk = torch.tensor(X[start:start + chunk_size], dtype=torch.float)
+                Y.append(self.model.predict(X_chunk).detach().numpy())
+        if len(Y) == 0:
+            return np.zeros((0, len(self.out_space['names'])))
+        return np.concatenate(Y)
+
+    def _graph_points(self, comb):
+        '''
+        Minimum point and its errors for the pair
 
         Parameters:
             comb: Used keywords indexes
 
         Return:
-            g1: Statistics errors TGraph
-            g2: MINUIT errors TGraph
+            Dict of single value float32 arrays
         '''
         min_point = self.min_point[comb]
         min_error = self.stat_error[comb]
         pos_error = self.pos_error[comb]
         neg_error = self.neg_error[comb]
+        values = {
+            'x': min_point[0], 'y': min_point[1],
+            'ex': min_error[0], 'ey': min_error[1],
+            'exl': neg_error[0], 'exh': pos_error[0],
+            'eyl': neg_error[1], 'eyh': pos_error[1]
+            }
+        return {key: np.array(value, dtype=np.float32) for key, value in values.items()}
 
-        x =  np.array(min_point[0], dtype=np.float32)
-        y = np.array(min_point[1], dtype=np.float32)
-        ex = np.array(min_error[0], dtype=np.float32)
-        ey = np.array(min_error[1], dtype=np.float32)
-        g1 = ROOT.TGraphErrors(1, x, y, ex, ey)
-        g1.SetMarkerColor(2)
-
-        exl = np.array(neg_error[0], dtype=np.float32)
-        exh = np.array(pos_error[0], dtype=np.float32)
-        eyl = np.array(neg_error[1], dtype=np.float32)
-        eyh = np.array(pos_error[1], dtype=np.float32)
-        g2 = ROOT.TGraphAsymmErrors(1, x, y, exl, exh, eyl, eyh)
-        g2.SetMarkerColor(6)
-        g2.SetMarkerStyle(21)
-
-        return g1, g2
-
-    @staticmethod
-    def _create_root_hist(chi2, points, axis1_bins, axis2_bins, labels=None):
-        '''
-        Create single plot
-
-        Parameters:
-            chi2 (numpy.array or torch.tensor): Chi square value for each point
-            points (numpy.array or torch.tensor): Data points
-            labels (str): Name and axis titles for the plot
-            fn (str): Output file path
-            mins (np.array): Calculated minima point for the model
-            min_error (np.array): Error calculation from convergence
-            pos_error (list): Positive error from MINUIT error calculation
-            neg_error (list): Negative error from MINUIT error calculation
-        '''
-        hist_name = '_'.join(labels.split(';'))
-        axis_x = set(list(axis1_bins))
-        axis_y = set(list(axis2_bins))
-        xbin = (max(axis_x) - min(axis_x))/(len(axis_x)-1)
-        ybin = (max(axis_y) - min(axis_y))/(len(axis_y)-1)
-        hist = ROOT.TH2F(hist_name, hist_name, len(axis_x), min(axis_x)-xbin/2, max(axis_x)+xbin/2, len(axis_y), min(axis_y)-ybin/2, max(axis_y)+ybin/2)
-        for point, c2 in zip(points,chi2):
-            xidx = int((point[0] - min(axis_x))/xbin + xbin/2)+1
-            yidx = int((point[1] - min(axis_y))/ybin + ybin/2)+1
-            hist.SetBinContent(xidx, yidx, c2)
-        hist.SetTitleOffset(1.5, "Y")
-        hist.SetTitle(labels)
-        return hist
-
-    @staticmethod
-    def draw_losses(output_path, loss_hist_name):
+    def draw_losses(self, output_path, loss_hist_name):
         '''
         Draw training loss function from saved JSON file
 
@@ -168,65 +453,31 @@ class Plotter:
         '''
         with open(output_path / loss_hist_name, encoding='utf8') as file_handler:
             loss_data = json.load(file_handler)
-        canv = ROOT.TCanvas('canv', 'canv', 800, 600)
         epochs = np.array(loss_data['epochs'], dtype=float)
         train = np.array(loss_data['train_loss'], dtype=float)
         test = np.array(loss_data['val_loss'], dtype=float)
-        N = len(epochs)
-        if N <1:
-            return
-        g1 = ROOT.TGraph(N, epochs, train)
-        g2 = ROOT.TGraph(N, epochs, test)
-
-        g2.SetLineColor(2)
-
-        mg = ROOT.TMultiGraph()
-        mg.Add(g1)
-        mg.Add(g2)
-        mg.Draw('AC')
-        mg.SetTitle('Training vs Validation history;Epochs;Average RMS/points')
-        leg = ROOT.TLegend(0.7,0.7,0.9,0.9)
-        leg.AddEntry(g1, 'train history', 'l')
-        leg.AddEntry(g2, 'val history', 'l')
-        leg.Draw()
-        canv.SetLogy()
-        output_path = output_path / 'loss.pdf'
-        canv.SaveAs(str(output_path))
+        backend = self._get_backend()
+        if backend is not None:
+            backend.draw_losses(output_path / 'loss.pdf', epochs, train, test)
 
     def draw_diff(self, output_path, data_reader):
         '''
-        Draw absoulute and relative differences
+        Draw absoulute and relative differences. Differences are also saved
+        next to the figure as ".npz".
 
         Parameters:
             output_path: Output path to save figure
             data_reader: DataReader object
         '''
-        canv = ROOT.TCanvas('canv', 'canv', 800, 600)
-        h1 = ROOT.TH1F('h1', 'h1', 400, -0.5, 0.5)
-        h2 = ROOT.TH1F('h2', 'h2', 400, -0.5, 0.5)
-
-#        train_loader, val_loader, _ = data_reader.get_data(240, norm=False)
-#        X_train, y_train = next(iter(train_loader))
-#        X_val , y_val = next(iter(val_loader))
-        X_train, X_val, y_train, y_val = data_reader.get_data(240, norm=False)
+        X_train, _, y_train, _ = data_reader.get_data(240, norm=False)
         y_train_pred = self.model.predict(X_train)
-        y_val_pred = self.model.predict(X_val)
-
-        y_train_pred = y_train_pred.mean(axis=1)
-        y_val_pred = y_val_pred.mean(axis=1)
-        y_train = y_train.mean(axis=1)
-        y_val = y_val.mean(axis=1)
-
-        for y_p, y in zip(y_train_pred, y_train):
-            h1.Fill(y_p - y)
-            h2.Fill((y_p - y)/y)
-
-        h2.SetLineColor(2)
-        h2.Draw()
-        h2.SetTitle('Model vs data;(chi2_average_pred - chi2_average_real);count')
-        leg = ROOT.TLegend(0.7,0.7,0.9,0.9)
-        leg.AddEntry(h1, 'absolute', 'l')
-        leg.AddEntry(h2, 'relative', 'l')
-        h1.Draw('same')
-        leg.Draw()
-        canv.SaveAs(str(output_path))
+
+        y_train_pred = y_train_pred.mean(axis=1).detach().numpy()
+        y_train = np.asarray(y_train.mean(axis=1))
+        abs_diff = y_train_pred - y_train
+        rel_diff = abs_diff/y_train
+
+        np.savez(Path(output_path).with_suffix('.npz'), abs_diff=abs_diff, rel_diff=rel_diff)
+        backend = self._get_backend()
+        if backend is not None:
+            backend.draw_diff(output_path, abs_diff, rel_diff)
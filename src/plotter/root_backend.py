@@ -0,0 +1,205 @@
+'''
+CERN ROOT plotting backend
+'''
+# To skip ROOT pylint errors
+#pylint: disable=E1101
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from tqdm import tqdm
+import ROOT
+import numpy as np
+
+ROOT.gROOT.SetBatch(True)
+ROOT.gStyle.SetOptStat(False)
+
+def render_maps(output_path, items, workers=1):
+    '''
+    Write 2D map canvases into the ROOT file
+
+    Parameters:
+        output_path: ROOT file path
+        items: (label, chi2, axis1_bins, axis2_bins, graph_points) of each map
+        workers: Number of processes. Each process writes its own ROOT file
+            and the files are merged into output_path.
+    '''
+    if workers > 1 and len(items) > 1:
+        _render_parallel(output_path, items, workers)
+        return
+
+    root_file = ROOT.TFile.Open(str(output_path), 'RECREATE')
+    for label, chi2, axis1_bins, axis2_bins, graph_points in items:
+        canv_name = '_'.join(label.split(';'))
+        canv = ROOT.TCanvas(canv_name, canv_name, 800, 600)
+        hist = create_hist(chi2, axis1_bins, axis2_bins, label)
+        g1, g2 = make_tgraphs(graph_points)
+        hist.Draw('colz')
+        g1.Draw('*')
+        g2.Draw('same')
+        canv.Write()
+    root_file.Close()
+
+def _render_parallel(output_path, items, workers):
+    '''
+    Render maps in a process pool and merge per-process ROOT files
+
+    Parameters:
+        output_path: Merged ROOT file path
+        items: (label, chi2, axis1_bins, axis2_bins, graph_points) of each map
+        workers: Number of processes
+    '''
+    workers = min(workers, len(items))
+    bounds = np.linspace(0, len(items), workers + 1).astype(int)
+    shards = [items[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+    part_paths = [output_path.with_name(f'{output_path.stem}_part{num}{output_path.suffix}') \
+for num in range(workers)]
+
+    # ROOT is not fork safe
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(workers, mp_context=context) as executor:
+        list(tqdm(executor.map(render_maps, part_paths, shards), total=workers))
+
+    merger = ROOT.TFileMerger(False)
+    merger.OutputFile(str(output_path), 'RECREATE')
+    for part_path in part_paths:
+        merger.AddFile(str(part_path))
+    if not merger.Merge():
+        print(f'ERROR: {output_path} cannot be merged from {[str(path) for path in part_paths]}!')
+        return
+    for part_path in part_paths:
+        part_path.unlink()
+
+def render_profiles(output_path, items):
+    '''
+    Write 1D chi2 profiles as TGraphs into the ROOT file
+
+    Parameters:
+        output_path: ROOT file path
+        items: (name, axis_bins, chi2, min_point) of each profile
+    '''
+    root_file = ROOT.TFile.Open(str(output_path), 'RECREATE')
+    for name, axis_bins, chi2, points in items:
+        graph_name = f'profile_{name}'
+        axis_bins = np.ascontiguousarray(axis_bins, dtype=float)
+        chi2 = np.ascontiguousarray(chi2, dtype=float)
+        graph = ROOT.TGraph(len(axis_bins), axis_bins, chi2)
+        graph.SetName(graph_name)
+        graph.SetTitle(f'{name};{name};chi2')
+        graph.Write(graph_name)
+
+        x = np.array([points['x']], dtype=float)
+        y = np.array([chi2.min() if len(chi2) != 0 else 0], dtype=float)
+        minimum = ROOT.TGraphAsymmErrors(1, x, y, np.array([points['exl']]), np.array([points['exh']]), \
+np.zeros(1), np.zeros(1))
+        minimum.SetName(f'{graph_name}_min')
+        minimum.SetMarkerColor(6)
+        minimum.SetMarkerStyle(21)
+        minimum.Write(f'{graph_name}_min')
+    root_file.Close()
+
+def make_tgraphs(points):
+    '''
+    Create two TGraphs one is for statistics errors, second MINUIT errors
+
+    Parameters:
+        points: Minimum point and errors dict of single value float32 arrays
+
+    Return:
+        g1: Statistics errors TGraph
+        g2: MINUIT errors TGraph
+    '''
+    g1 = ROOT.TGraphErrors(1, points['x'], points['y'], points['ex'], points['ey'])
+    g1.SetMarkerColor(2)
+
+    g2 = ROOT.TGraphAsymmErrors(1, points['x'], points['y'], points['exl'], points['exh'], \
+points['eyl'], points['eyh'])
+    g2.SetMarkerColor(6)
+    g2.SetMarkerStyle(21)
+
+    return g1, g2
+
+def create_hist(chi2, axis1_bins, axis2_bins, labels=None):
+    '''
+    Create single plot
+
+    Parameters:
+        chi2 (numpy.array): (len(axis1_bins), len(axis2_bins)) chi square grid
+        axis1_bins (numpy.array): Grid nodes of X axis
+        axis2_bins (numpy.array): Grid nodes of Y axis
+        labels (str): Name and axis titles for the plot
+
+    Return:
+        hist: Filled TH2F
+    '''
+    hist_name = '_'.join(labels.split(';'))
+    nx, ny = len(axis1_bins), len(axis2_bins)
+    xbin = (axis1_bins[-1] - axis1_bins[0])/(nx-1) if nx > 1 else 1
+    ybin = (axis2_bins[-1] - axis2_bins[0])/(ny-1) if ny > 1 else 1
+    hist = ROOT.TH2F(hist_name, hist_name, nx, axis1_bins[0]-xbin/2, axis1_bins[-1]+xbin/2, \
+ny, axis2_bins[0]-ybin/2, axis2_bins[-1]+ybin/2)
+
+    # Global bin of (ix, iy) is iy*(nx+2) + ix, under and overflow bins stay empty
+    content = np.zeros((ny+2, nx+2))
+    content[1:-1, 1:-1] = np.asarray(chi2, dtype=float).T
+    hist.SetContent(np.ascontiguousarray(content.ravel()))
+    hist.SetTitleOffset(1.5, "Y")
+    hist.SetTitle(labels)
+    return hist
+
+def draw_losses(output_path, epochs, train, test):
+    '''
+    Draw training and validation loss history
+
+    Parameters:
+        output_path: Output figure path
+        epochs: Epochs of the loss values
+        train: Training loss values
+        test: Validation loss values
+    '''
+    canv = ROOT.TCanvas('canv', 'canv', 800, 600)
+    N = len(epochs)
+    if N <1:
+        return
+    g1 = ROOT.TGraph(N, epochs, train)
+    g2 = ROOT.TGraph(N, epochs, test)
+
+    g2.SetLineColor(2)
+
+    mg = ROOT.TMultiGraph()
+    mg.Add(g1)
+    mg.Add(g2)
+    mg.Draw('AC')
+    mg.SetTitle('Training vs Validation history;Epochs;Average RMS/points')
+    leg = ROOT.TLegend(0.7,0.7,0.9,0.9)
+    leg.AddEntry(g1, 'train history', 'l')
+    leg.AddEntry(g2, 'val history', 'l')
+    leg.Draw()
+    canv.SetLogy()
+    canv.SaveAs(str(output_path))
+
+def draw_diff(output_path, abs_diff, rel_diff):
+    '''
+    Draw absoulute and relative differences
+
+    Parameters:
+        output_path: Output path to save figure
+        abs_diff: Absolute differences of averaged chi2
+        rel_diff: Relative differences of averaged chi2
+    '''
+    canv = ROOT.TCanvas('canv', 'canv', 800, 600)
+    h1 = ROOT.TH1F('h1', 'h1', 400, -0.5, 0.5)
+    h2 = ROOT.TH1F('h2', 'h2', 400, -0.5, 0.5)
+    for hist, values in ((h1, abs_diff), (h2, rel_diff)):
+        values = np.ascontiguousarray(values, dtype=float)
+        if len(values) != 0:
+            hist.FillN(len(values), values, np.ones(len(values)))
+
+    h2.SetLineColor(2)
+    h2.Draw()
+    h2.SetTitle('Model vs data;(chi2_average_pred - chi2_average_real);count')
+    leg = ROOT.TLegend(0.7,0.7,0.9,0.9)
+    leg.AddEntry(h1, 'absolute', 'l')
+    leg.AddEntry(h2, 'relative', 'l')
+    h1.Draw('same')
+    leg.Draw()
+    canv.SaveAs(str(output_path))
@@ -7,10 +7,8 @@ import shutil
 from typing import Tuple
 import logging
 
-from .data_handler import DataGenerator, DataReader
-from .models import RICHAlignmentModel
-from .minimizers import Minimizer
-from .plotter import Plotter
+# Heavy modules (torch, scikit-learn, ROOT) are imported in the stage that needs them
+# pylint: disable=import-outside-toplevel
 
 class RICHAlignment():
     '''
@@ -40,6 +38,10 @@ class RICHAlignment():
         Parameters:
             output_dir (str): Folder dir to save model outputs
         """
+        from .data_handler import DataReader
+        from .models import RICHAlignmentModel
+        from .plotter import Plotter
+
         with open(self.input_jsons_dir/'training_config.json', encoding='utf8') as file_handler:
             train_meta_data = json.load(file_handler)
         keywords_path = self.input_jsons_dir / train_meta_data['META']['keywords_name']
@@ -67,7 +69,7 @@ class RICHAlignment():
         with open(output_dir/'training_config.json', 'w', encoding='utf8') as fw:
             json.dump(train_meta_data, fw, indent=2)
 
-        plots = Plotter(model)
+        plots = Plotter(model, train_meta_data.get('PLOTS', {}).get('backend', 'root'))
         plots.draw_losses(output_dir, res['loss_hist_name'])
         plots.draw_diff(output_dir/'diff.pdf', data_reader)  
 
@@ -81,6 +83,10 @@ class RICHAlignment():
         Return:
             None
         '''
+        from .models import RICHAlignmentModel
+        from .minimizers import Minimizer
+        from .plotter import Plotter
+
         trained_model_dir = Path(trained_model_dir)
         with open(trained_model_dir/'training_config.json', encoding='utf8') as file_handler:
             train_data = json.load(file_handler)
@@ -104,6 +110,8 @@ minima_data['MINIMA']['precisions'], mixing)
 
         minimizer = Minimizer(model, minima_data)
         min_point, min_error, pos_error, neg_error = minimizer.find_minima(in_space)
+        if minimizer.cache is not None:
+            print(f'NOTE: Prediction cache {minimizer.cache.info()}')
 
         res = {
             'min_point': list(min_point),
@@ -111,18 +119,26 @@ minima_data['MINIMA']['precisions'], mixing)
             'neg_error': list(neg_error),
             'pos_error': list(pos_error)
             }
+        if minimizer.hesse_result is not None:
+            res.update(minimizer.hesse_result)
 
         with open(trained_model_dir/'results.json', 'w', encoding='utf8') as fw:
             json.dump(res, fw, indent=2)
 
-        plots = Plotter(model)
+        plots_info = minima_data.get('PLOTS', {})
+        plots = Plotter(model, plots_info.get('backend', 'root'))
         plots.setup_prediction_plotter(in_space, out_space, res)
-        root_path = trained_model_dir / 'plots.root'
-        plots.create_root_tree(root_path)
+        if plots_info.get('cache', False):
+            plots.set_cache(trained_model_dir/'.plot_cache')
+        plots.create_maps(trained_model_dir, channels=plots_info.get('channels', False), \
+workers=plots_info.get('workers', 1))
+        if plots_info.get('profiles', True):
+            plots.create_profiles(trained_model_dir)
 
 
     def create_data(self, output_dir: str or Path, number_of_points: int, \
-        geo_path=None, opt_path=None) -> None:
+        geo_path=None, opt_path=None, sampling='uniform', seed=None, workers=1, \
+        sidecar=None) -> None:
         '''
         Creates data points similar to templates that are used for RICH Fast Monte
         Carlo simulation
@@ -132,7 +148,12 @@ minima_data['MINIMA']['precisions'], mixing)
             number_of_point: Number of alignment combinations to create
             geo_path: Geometry template file path
             opt_path: Optical template file path
+            sampling: Design strategy "uniform", "lhs", "sobol" or "grid"
+            seed: Random seed for the data generation
+            workers: Number of processes to write files
+            sidecar: If "npz" or "csv" generated parameters are also saved without ROOT
         '''
+        from .data_handler import DataGenerator
 
         if isinstance(geo_path, str):
             geo_path = Path(geo_path)
@@ -146,7 +167,7 @@ minima_data['MINIMA']['precisions'], mixing)
         template_path = {'geo': geo_path, 'opt': opt_path}
 
         data_gen = DataGenerator(keywords_data['INPUT'], template_path)
-        data_gen.create(output_dir, number_of_points)
+        data_gen.create(output_dir, number_of_points, sampling, seed, workers, sidecar)
 
     @staticmethod
     def _create_workspace(keywords:dict, precisions:dict, mixing:str)->Tuple[dict]:
@@ -160,11 +181,14 @@ minima_data['MINIMA']['precisions'], mixing)
                 account positive and negative parts.
 
         Return:
-            in_space: Input space from keywords, precisions and space values
+            in_space: Input space from keywords, precisions and space values. "dofs"
+                is the shared degree of freedom index of each feature, features
+                linked by "corr" have the same one.
             out_space: Output space keywords names
         '''
-        in_space = {'space': [], 'names': [], 'precisions': []}
+        in_space = {'space': [], 'names': [], 'precisions': [], 'dofs': []}
         out_space = {'names': []}
+        corrs = {}
 
         input_keywords = keywords['INPUT']['GEOMETRY'] + keywords['INPUT']['OPTICAL']
         for inkw in input_keywords:
@@ -178,11 +202,26 @@ minima_data['MINIMA']['precisions'], mixing)
                     elif name.find('ref_index') > 0:
                         feature_is = 'ref_index'
                     in_space['precisions'].append(precisions[feature_is])
+                    if 'corr' in value:
+                        corrs[name] = value['corr']
+
+        roots = {name: name for name in in_space['names']}
+        def find_root(name):
+            while roots[name] != name:
+                name = roots[name]
+            return name
+        for name, corr_name in corrs.items():
+            if corr_name in roots:
+                roots[find_root(corr_name)] = find_root(name)
+        dof_index = {}
+        for name in in_space['names']:
+            in_space['dofs'].append(dof_index.setdefault(find_root(name), len(dof_index)))
 
         if mixing == 'charge':
             in_space['space'].append([0,1,1])
             in_space['names'].append('charge')
             in_space['precisions'].append(1)
+            in_space['dofs'].append(len(dof_index))
 
         output_keywords = keywords['OUTPUT']['AEROGEL'] + keywords['OUTPUT']['TOPOLOGY'] + keywords['OUTPUT']['MAPMT'] + keywords['OUTPUT']['TRACKS']
         names = []
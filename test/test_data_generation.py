@@ -1,6 +1,9 @@
 from pathlib import Path
 import tempfile
 
+import numpy as np
+import ROOT
+
 from src.rich_alignment import RICHAlignment
 
 jsons_path = Path('test')/'jsons'
@@ -35,3 +38,55 @@ def test_only_geo_data():
     assert len(list(output_path.glob('geo/*.dat'))) == 10
     assert len(list(output_path.glob('*.root'))) == 1
 
+def test_seeded_data():
+    geo_path = Path('test')/'data'/'RichModGeometry.dat'
+    opt_path = Path('test')/'data'/'RichModOptical.dat'
+
+    with tempfile.TemporaryDirectory() as dir_name:
+        rich_align = RICHAlignment(jsons_path)
+        rich_align.create_data(Path(dir_name)/'1', 5, geo_path, opt_path, 'lhs', 11)
+        rich_align.create_data(Path(dir_name)/'2', 5, geo_path, opt_path, 'lhs', 11)
+        for file_type in ('geo', 'opt'):
+            files1 = sorted((Path(dir_name)/'1'/file_type).glob('*.dat'))
+            files2 = sorted((Path(dir_name)/'2'/file_type).glob('*.dat'))
+            assert len(files1) == 5
+            for file1, file2 in zip(files1, files2):
+                assert file1.read_text() == file2.read_text()
+
+def test_parallel_data():
+    geo_path = Path('test')/'data'/'RichModGeometry.dat'
+    opt_path = Path('test')/'data'/'RichModOptical.dat'
+
+    with tempfile.TemporaryDirectory() as dir_name:
+        rich_align = RICHAlignment(jsons_path)
+        rich_align.create_data(Path(dir_name)/'serial', 7, geo_path, opt_path, seed=5)
+        rich_align.create_data(Path(dir_name)/'parallel', 7, geo_path, opt_path, seed=5, workers=3)
+        for file_type in ('geo', 'opt'):
+            files1 = sorted((Path(dir_name)/'serial'/file_type).glob('*.dat'))
+            files2 = sorted((Path(dir_name)/'parallel'/file_type).glob('*.dat'))
+            assert [file.name for file in files1] == [file.name for file in files2]
+            for file1, file2 in zip(files1, files2):
+                assert file1.read_bytes() == file2.read_bytes()
+
+def test_tree_and_sidecar():
+    geo_path = Path('test')/'data'/'RichModGeometry.dat'
+
+    with tempfile.TemporaryDirectory() as dir_name:
+        rich_align = RICHAlignment(jsons_path)
+        rich_align.create_data(Path(dir_name)/'npz', 6, geo_path, None, seed=2, sidecar='npz')
+        rich_align.create_data(Path(dir_name)/'csv', 6, geo_path, None, seed=2, sidecar='csv')
+
+        npz_data = np.load(Path(dir_name)/'npz'/'data.npz')
+        csv_data = np.genfromtxt(Path(dir_name)/'csv'/'data.csv', delimiter=',', names=True)
+        assert list(npz_data.keys()) == list(csv_data.dtype.names)
+        assert len(npz_data['aerogel_b2_z']) == 6
+
+        root_file = ROOT.TFile.Open(str(Path(dir_name)/'npz'/'data.root'))
+        tree = root_file.Get('evtTree')
+        assert tree.GetEntries() == 6
+        for i in range(6):
+            tree.GetEntry(i)
+            for name in npz_data.keys():
+                assert getattr(tree, name) == npz_data[name][i]
+                assert csv_data[name][i] == npz_data[name][i]
+        root_file.Close()
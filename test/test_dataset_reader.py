@@ -0,0 +1,90 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import shutil
+
+import pytest
+import torch
+
+from src.data_handler.dataset_reader import DatasetReader
+
+data_path = Path('test')/'data'
+
+file_names = {
+    'geo': 'RichModGeometry.dat',
+    'opt': 'RichModOptical.dat',
+    'aer': 'RichReco_FastMC.root_hist.root_hm_Aerogel.out',
+    'top': ['RichReco_FastMC.root_hist.root_hm_planA2L.out'],
+    'pmt': 'RichReco_FastMC.root_hist.root_hm_MAPMT.out',
+    'trk': 'RichReco_FastMC.root_hist.root_hm_Tracks.out'
+}
+
+keywords = {
+    'geo': ['aerogel_b2_z', 'aerogel_b2_theta_x'],
+    'opt': ['aerogel_b2_ref_index'],
+    'aer': ['aerogel_b2_dp_chi2', 'aerogel_b2_a2l_chi2'],
+    'top': [],
+    'pmt': ['mapmt_chi2'],
+    'trk': ['track_pmt_1_mean']
+}
+
+def _make_dataset(dataset_dir, folder_names):
+    for folder in folder_names:
+        shutil.copytree(data_path, dataset_dir / folder)
+
+def test_cache_reuse():
+    with TemporaryDirectory() as dir_name:
+        dataset_dir = Path(dir_name)
+        folder_names = ['0', '1', '2']
+        _make_dataset(dataset_dir, folder_names)
+
+        reader = DatasetReader(dataset_dir, file_names, cache=True)
+        x, y = reader.read_dataset(folder_names, keywords)
+        assert len(list((dataset_dir/'.cache').glob('*.npy'))) == 2
+
+        x_cached, y_cached = reader.read_dataset(folder_names, keywords)
+        assert torch.equal(x, x_cached)
+        assert torch.equal(y, y_cached)
+        assert x_cached.shape == (3, 3)
+        assert y_cached.shape == (3, 4)
+
+def test_cache_invalidation():
+    with TemporaryDirectory() as dir_name:
+        dataset_dir = Path(dir_name)
+        folder_names = ['0', '1']
+        _make_dataset(dataset_dir, folder_names)
+
+        reader = DatasetReader(dataset_dir, file_names, cache=True)
+        key = reader.cache.key(folder_names, keywords)
+        reader.read_dataset(folder_names, keywords)
+
+        with open(dataset_dir/'1'/file_names['pmt'], 'a', encoding='utf8') as file_writer:
+            file_writer.write('\n')
+        assert reader.cache.key(folder_names, keywords) != key
+
+        other_keywords = dict(keywords, geo=['aerogel_b2_z'])
+        assert reader.cache.key(folder_names, other_keywords) != key
+
+def test_parallel_read():
+    with TemporaryDirectory() as dir_name:
+        dataset_dir = Path(dir_name)
+        folder_names = [str(i) for i in range(6)]
+        _make_dataset(dataset_dir, folder_names)
+        (dataset_dir/'3'/file_names['aer']).unlink()
+
+        x, y = DatasetReader(dataset_dir, file_names).read_dataset(folder_names, keywords)
+        reader = DatasetReader(dataset_dir, file_names, io_workers=4)
+        x_par, y_par = reader.read_dataset(folder_names, keywords)
+        assert reader.failed_folders == ['3']
+        assert x_par.shape == (5, 3)
+        assert torch.equal(x, x_par)
+        assert torch.equal(y, y_par)
+
+def test_all_folders_failed():
+    with TemporaryDirectory() as dir_name:
+        dataset_dir = Path(dir_name)
+        folder_names = ['0', '1']
+        _make_dataset(dataset_dir, folder_names)
+        reader = DatasetReader(dataset_dir, dict(file_names, pmt='missing.out'), io_workers=2)
+        with pytest.raises(FileNotFoundError, match='None of the 2 data points'):
+            reader.read_dataset(folder_names, keywords)
+        assert reader.failed_folders == folder_names
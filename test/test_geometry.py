@@ -1,6 +1,8 @@
 from tempfile import TemporaryDirectory
 from pathlib import Path
 
+import numpy as np
+
 from src.file_handler.data_parser import DataParser
 
 def test_geometry_reader():
@@ -66,3 +68,42 @@ def test_geometry_v2_writer():
 
 
 
+
+def test_geometry_selected_keywords():
+    dp = DataParser()
+    data_path = Path('test')/'data'/'RichModGeometry.dat'
+    keywords = ['mapmt_theta_y', 'aerogel_b2_z', 'spherical_mirror_s2c_x']
+    geometry_data = dp.read_file(data_path, keywords)
+
+    assert list(geometry_data) == ['aerogel_b2_z', 'spherical_mirror_s2c_x', 'mapmt_theta_y']
+    assert geometry_data['mapmt_theta_y'] == -1.0
+    assert geometry_data['aerogel_b2_z'] == 6.0
+    assert geometry_data['spherical_mirror_s2c_x'] == -1.2
+
+
+def test_geometry_compiled_template():
+    with TemporaryDirectory() as dir_name:
+        # Header with braces checks template escaping
+        temp_lines = (Path('test')/'data'/'RichModGeometry.dat').read_text().splitlines(keepends=True)
+        temp_lines[3] = 'AerogelB2 surface: {shifts} (mm), thetax,thetay,thetaz (rad)\n'
+        data_path = Path(dir_name)/'RichModGeometry.dat'
+        data_path.write_text(''.join(temp_lines))
+
+        keywords = ['aerogel_b2_z', 'aerogel_b2_theta_x', 'spherical_mirror_s5c_z', 'mapmt_theta_y']
+        values = np.array([[1.23456, 0.000123456, -1234.5, 0.5], [-2.0, -0.0075, 8.5, -0.002]])
+        # Lines and number formatting written by the original create_file
+        expected_lines = [
+            {4: '0.1 0.6 1.235\n', 5: '0.000123 0.04 0\n', 55: '2. 0. -1.234e+03\n', 62: '0.0 0.5 0.0\n'},
+            {4: '0.1 0.6 -2.0\n', 5: '-0.0075 0.04 0\n', 55: '2. 0. 8.5\n', 62: '0.0 -0.002 0.0\n'}
+        ]
+        dp = DataParser()
+        template = dp.compile_template(data_path, keywords)
+        out_paths = [Path(dir_name) / f'RichModGeometry_{i}.dat' for i in range(len(values))]
+        template.write_many(out_paths, values)
+
+        for out_path, changed in zip(out_paths, expected_lines):
+            expected = [changed.get(num, line) for num, line in enumerate(temp_lines)]
+            assert out_path.read_text() == ''.join(expected)
+
+        data_new = dp.read_file(out_paths[0], keywords)
+        assert [data_new[key] for key in keywords] == [1.235, 0.000123, -1234.0, 0.5]
@@ -0,0 +1,19 @@
+import subprocess
+import sys
+
+IMPORT_TIME_BUDGET = 1.0
+
+def test_import_time():
+    code = '''
+import sys
+import time
+start = time.perf_counter()
+import src
+print(time.perf_counter() - start)
+print(','.join(name for name in ('torch', 'sklearn', 'ROOT') if name in sys.modules))
+'''
+    output = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True)
+    import_time, heavy_modules = output.stdout.split('\n')[:2]
+
+    assert heavy_modules == ''
+    assert float(import_time) < IMPORT_TIME_BUDGET
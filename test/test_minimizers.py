@@ -0,0 +1,353 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+import torch
+
+from src.rich_alignment import RICHAlignment
+from src.minimizers import Minimizer
+from src.minimizers.cmaes_minimizer import CMAESMinimizer
+from src.minimizers.gen_minimizer import GenMinimizer
+from src.minimizers.grid_minimizer import GridMinimizer
+from src.minimizers.lbfgs_minimizer import LBFGSMinimizer
+from src.minimizers.reduced_space import reduce_space
+from src.minimizers.refine_minimizer import RefineMinimizer
+from src.minimizers.sgd_minimizer import SGDMinimizer
+
+class QuadraticModel():
+    '''
+    Surrogate with known minimum, chi2 = ((x - center)/scale)**2 per feature
+    '''
+    def __init__(self):
+        self.center = torch.tensor([1.0, -0.005])
+        self.scale = torch.tensor([0.1, 0.002])
+        self.calls = 0
+
+    def predict(self, x, grad=False):
+        self.calls += 1
+        with torch.set_grad_enabled(grad):
+            return ((x - self.center)/self.scale)**2
+
+in_space = {
+    'space': [[-5, 5, 41], [-0.02, 0.02, 41]],
+    'names': ['aerogel_b2_z', 'aerogel_b2_theta_x'],
+    'precisions': [0.1, 1e-4]
+}
+
+def _check_minimum(min_point, model):
+    assert abs(min_point[0] - float(model.center[0])) < 1e-2
+    assert abs(min_point[1] - float(model.center[1])) < 1e-4
+
+def test_sgd_minimizer():
+    np.random.seed(0)
+    for gradient in ('numeric', 'autograd'):
+        model = QuadraticModel()
+        minimizer = SGDMinimizer(model)
+        minimizer.set_precisions(in_space['precisions'])
+        min_point, min_error = minimizer.minimize(in_space, iters=300, number_of_samples=20, \
+momentum=0.9, gradient=gradient)
+        _check_minimum(min_point, model)
+        assert len(min_error) == 2
+        assert model.calls <= 300
+
+def test_genetic_minimizer():
+    np.random.seed(0)
+    torch.manual_seed(0)
+    model = QuadraticModel()
+    minimizer = GenMinimizer(model)
+    minimizer.set_precisions(in_space['precisions'])
+    min_point, min_error = minimizer.minimize(in_space, iters=5, number_of_samples=50)
+    _check_minimum(min_point, model)
+    assert min_error.shape == (2,)
+    # One surrogate call for the start population and one per generation
+    assert model.calls <= 100
+
+def test_error_scan():
+    model = QuadraticModel()
+    minimizer = SGDMinimizer(model)
+    point = model.center.numpy()
+    for up in (1, 4):
+        pos_errs, neg_errs = minimizer.min_error_scan(point, up, 10000, 0.1, 100)
+        expected = (model.scale*up**0.5).tolist()
+        assert np.allclose(pos_errs, expected, rtol=1e-3)
+        assert np.allclose(neg_errs, expected, rtol=1e-3)
+        assert np.allclose(minimizer.min_error_calc(point, None, up, 10000, -0.1, -100), neg_errs)
+
+def test_error_scan_not_bracketed():
+    model = QuadraticModel()
+    model.scale = torch.tensor([1e3, 1e3])
+    minimizer = SGDMinimizer(model)
+    pos_errs, _ = minimizer.min_error_scan(model.center.numpy(), 1, 100, 0.1, 100)
+    assert np.allclose(pos_errs, 99*np.abs(model.center.numpy()))
+
+def test_hesse_errors():
+    model = QuadraticModel()
+    minimizer = SGDMinimizer(model)
+    minimizer.set_precisions(in_space['precisions'])
+    point = model.center.numpy()
+    cov, corr, errs = minimizer.hesse(point, 1)
+    assert np.allclose(errs, model.scale.numpy(), rtol=1e-4)
+    assert np.allclose(cov, np.diag(model.scale.numpy()**2), rtol=1e-4)
+    assert np.allclose(corr, np.eye(2), atol=1e-6)
+
+    hess = minimizer._gradient_hessian(model.center)
+    assert np.allclose(hess.numpy(), np.diag(2/model.scale.numpy()**2), rtol=1e-3)
+
+class ReluModel:
+    '''
+    Piecewise linear (ReLU) surrogate of QuadraticModel, the last feature is
+    a charge flag that shifts chi2 linearly
+    '''
+    def __init__(self):
+        self.center = torch.tensor([1.0, -0.005])
+        self.scale = torch.tensor([0.1, 0.002])
+        self.knots = torch.linspace(-5, 5, 1001)
+
+    def predict(self, x, grad=False):
+        with torch.set_grad_enabled(grad):
+            z = ((x[..., :2] - self.center)/self.scale)[..., None]
+            step = self.knots[1] - self.knots[0]
+            chi2 = (2*step*torch.relu(z - self.knots)).sum(axis=-1) - 10*z[..., 0]
+            return chi2 + x[..., 2:]
+
+def test_hesse_relu_fixed_charge():
+    model = ReluModel()
+    minimizer = SGDMinimizer(model)
+    minimizer.set_precisions([0.1, 5e-4, 1])
+    point = torch.cat((model.center, torch.tensor([1.0])))
+    autograd_hess = torch.autograd.functional.hessian(
+        lambda x: model.predict(x.reshape((1, -1)), grad=True).sum(), point)
+    assert torch.count_nonzero(autograd_hess) == 0
+
+    cov, corr, errs = minimizer.hesse(point.numpy(), 1, [2])
+    assert np.allclose(errs[:2], model.scale.numpy(), rtol=2e-2)
+    assert errs[2] == 0
+    assert np.all(cov[2] == 0) and np.all(cov[:, 2] == 0)
+    assert np.allclose(corr, np.eye(3), atol=1e-2)
+
+def test_minimizer_hesse_charge(capsys):
+    np.random.seed(0)
+    charge_space = {
+        'space': in_space['space'] + [[0, 1, 1]],
+        'names': in_space['names'] + ['charge'],
+        'precisions': [0.1, 5e-4, 1]
+    }
+    configs = {'MINIMA': {'type': 'lbfgs', 'iters': 100, 'number_of_samples': 10, 'errors': 'hesse'}}
+    minimizer = Minimizer(ReluModel(), configs)
+    minimizer.find_minima(charge_space)
+    assert 'not positive definite' not in capsys.readouterr().out
+    assert minimizer.hesse_result['hesse_error'][2] == 0
+    assert np.allclose(minimizer.hesse_result['hesse_error'][:2], [0.1, 0.002], rtol=5e-2)
+
+class SaddleModel(QuadraticModel):
+    '''
+    QuadraticModel with negative curvature along the second feature
+    '''
+    def predict(self, x, grad=False):
+        chi2 = super().predict(x, grad)
+        return torch.stack((chi2[..., 0], -chi2[..., 1]), dim=-1)
+
+def test_hesse_indefinite(capsys):
+    model = SaddleModel()
+    minimizer = SGDMinimizer(model)
+    minimizer.set_precisions(in_space['precisions'])
+    _, corr, errs = minimizer.hesse(model.center.numpy(), 1)
+    assert 'are not positive' in capsys.readouterr().out
+    assert np.isclose(errs[0], 0.1, rtol=1e-3)
+    assert np.isnan(errs[1])
+    assert np.array_equal(corr, np.eye(2))
+
+def test_minimizer_hesse_saddle():
+    np.random.seed(0)
+    configs = {'MINIMA': {'type': 'lbfgs', 'iters': 100, 'number_of_samples': 10, 'errors': 'hesse'}}
+    minimizer = Minimizer(SaddleModel(), configs)
+    _, _, pos_error, neg_error = minimizer.find_minima(in_space)
+    assert minimizer.hesse_result['hesse_error'][1] is None
+    assert np.isclose(minimizer.hesse_result['hesse_error'][0], 0.1, rtol=1e-3)
+    assert np.all(np.isfinite(pos_error)) and np.all(np.isfinite(neg_error))
+    json.dumps(minimizer.hesse_result, allow_nan=False)
+
+def test_minimizer_hesse_config():
+    np.random.seed(0)
+    configs = {'MINIMA': {'type': 'sgd', 'momentum': 0.9, 'gradient': 'autograd', \
+'iters': 300, 'number_of_samples': 20, 'errors': 'hesse'}}
+    minimizer = Minimizer(QuadraticModel(), configs)
+    _, _, pos_error, neg_error = minimizer.find_minima(in_space)
+    assert pos_error == neg_error == minimizer.hesse_result['hesse_error']
+    assert np.array(minimizer.hesse_result['correlation']).shape == (2, 2)
+
+def test_lbfgs_minimizer():
+    np.random.seed(0)
+    model = QuadraticModel()
+    minimizer = LBFGSMinimizer(model)
+    minimizer.set_precisions(in_space['precisions'])
+    min_point, min_error = minimizer.minimize(in_space, iters=100, number_of_samples=20)
+    _check_minimum(min_point, model)
+    assert min_error.shape == (2,)
+    assert model.calls == minimizer.evaluations <= 500
+
+def test_lbfgs_minimum_on_bound():
+    np.random.seed(0)
+    model = QuadraticModel()
+    # Unconstrained minimum is outside the box, the bounded one is on its edge
+    model.center = torch.tensor([7.0, -0.005])
+    minimizer = LBFGSMinimizer(model)
+    minimizer.set_precisions(in_space['precisions'])
+    min_point, _ = minimizer.minimize(in_space, iters=100, number_of_samples=10, max_eval=200)
+    assert min_point[0] == 5.0
+    assert abs(min_point[1] + 0.005) < 1e-4
+    assert model.calls <= 200
+
+def test_lbfgs_independent_starts():
+    class NaNModel(QuadraticModel):
+        # Non-finite chi2 for points with z below -2
+        def predict(self, x, grad=False):
+            chi2 = super().predict(x, grad)
+            return chi2 + torch.where(x[:, :1] < -2, float('nan'), 0.0)
+
+    np.random.seed(1)
+    model = NaNModel()
+    minimizer = LBFGSMinimizer(model)
+    minimizer.set_precisions(in_space['precisions'])
+    min_point, _ = minimizer.minimize(in_space, iters=100, number_of_samples=10)
+    np.random.seed(1)
+    start_points = minimizer.get_start_points(in_space, 10)
+
+    # Starts with non-finite chi2 stop where they are, the others still converge
+    bad = start_points[:, 0] < -2
+    assert bad.any() and (~bad).any()
+    assert np.allclose(minimizer.end_points[bad], start_points[bad])
+    assert np.all(np.abs(minimizer.end_points[~bad] - model.center.numpy()) < [1e-2, 1e-4])
+    _check_minimum(min_point, model)
+
+def test_cmaes_minimizer():
+    np.random.seed(0)
+    torch.manual_seed(0)
+    model = QuadraticModel()
+    minimizer = CMAESMinimizer(model)
+    minimizer.set_precisions(in_space['precisions'])
+    min_point, min_error = minimizer.minimize(in_space, iters=4, number_of_samples=10)
+    _check_minimum(min_point, model)
+    assert min_error.shape == (2,)
+    # One surrogate call per generation for all restarts
+    assert model.calls <= 200
+
+class ChargeModel(QuadraticModel):
+    '''
+    QuadraticModel with an extra charge feature that does not change chi2
+    '''
+    def predict(self, x, grad=False):
+        return super().predict(x[..., :2], grad)
+
+def test_cmaes_narrow_feature():
+    np.random.seed(0)
+    torch.manual_seed(0)
+    charge_space = {
+        'space': in_space['space'] + [[0, 1, 1]],
+        'names': in_space['names'] + ['charge'],
+        'precisions': in_space['precisions'] + [1]
+    }
+    model = ChargeModel()
+    minimizer = CMAESMinimizer(model)
+    minimizer.set_precisions(charge_space['precisions'])
+    min_point, _ = minimizer.minimize(charge_space, iters=4, number_of_samples=10)
+    _check_minimum(min_point, model)
+    # One-step charge range does not shrink steps of the other features
+    assert model.calls <= 70
+
+def test_grid_minimizer():
+    model = QuadraticModel()
+    minimizer = GridMinimizer(model)
+    minimizer.set_precisions(in_space['precisions'])
+    min_point, min_error = minimizer.minimize(in_space, top_k=5, chunk_size=100)
+    _check_minimum(min_point, model)
+    assert min_error.shape == (2,)
+    assert model.calls == 17
+    assert len(minimizer.top_points) == 5
+    assert np.all(np.diff(minimizer.top_chi2) >= 0)
+
+    parallel = GridMinimizer(model)
+    parallel_point, _ = parallel.minimize(in_space, top_k=5, chunk_size=100, workers=2)
+    assert np.allclose(parallel_point, min_point)
+    assert np.allclose(parallel.top_chi2, minimizer.top_chi2)
+
+def test_refine_minimizer():
+    model = QuadraticModel()
+    minimizer = RefineMinimizer(model)
+    minimizer.set_precisions(in_space['precisions'])
+    min_point, min_error = minimizer.minimize(in_space, coarse_points=5, top_k=4)
+    assert np.all(np.abs(min_point - model.center.numpy()) <= in_space['precisions'])
+    assert min_error.shape == (2,)
+    # One model call per level, far fewer evaluations than the full grid
+    assert model.calls <= 10
+    assert minimizer.evaluations < 41*41
+
+class LinkedModel(QuadraticModel):
+    '''
+    Surrogate of two features that always move together
+    '''
+    def __init__(self):
+        super().__init__()
+        self.center = torch.tensor([1.0, 1.0])
+        self.scale = torch.tensor([0.1, 0.1])
+        self.dims = []
+
+    def predict(self, x, grad=False):
+        self.dims.append(x.shape[-1])
+        return super().predict(x, grad)
+
+def test_reduced_space_minimization():
+    np.random.seed(0)
+    linked_space = {
+        'space': [[-5, 5, 41], [-4, 6, 21]],
+        'names': ['aerogel_b2_z', 'frontal_mirror_b2_z'],
+        'precisions': [0.1, 0.1],
+        'dofs': [0, 0]
+    }
+    reduced_space, dofs = reduce_space(linked_space)
+    assert reduced_space['space'] == [[-4, 5, 41]]
+    assert reduced_space['names'] == ['aerogel_b2_z']
+
+    configs = {'MINIMA': {'type': 'lbfgs', 'iters': 100, 'number_of_samples': 10, 'errors': 'both'}}
+    model = LinkedModel()
+    min_point, min_error, pos_error, neg_error = Minimizer(model, configs).find_minima(linked_space)
+    assert set(model.dims) == {2}
+    assert len(min_point) == len(min_error) == len(pos_error) == len(neg_error) == 2
+    assert np.allclose(min_point, [1.0, 1.0], atol=1e-3)
+    assert pos_error[0] == pos_error[1]
+    # Summed chi2 of both features rises by 1 at 0.1/sqrt(2)
+    assert np.allclose(neg_error, 0.1/np.sqrt(2), rtol=1e-2)
+
+def test_reduced_space_disjoint_grids():
+    linked_space = {
+        'space': [[-5, -1, 41], [1, 6, 21]],
+        'names': ['aerogel_b2_z', 'frontal_mirror_b2_z'],
+        'precisions': [0.1, 0.1],
+        'dofs': [0, 0]
+    }
+    with pytest.raises(ValueError, match='aerogel_b2_z, frontal_mirror_b2_z'):
+        reduce_space(linked_space)
+
+def test_workspace_dofs():
+    with open(Path('jsons')/'keywords.json', encoding='utf8') as file_handler:
+        keywords = json.load(file_handler)
+    keywords['INPUT']['GEOMETRY'].append({'frontal_mirror_b2_z': {'exists': True, 'grid': [-10, 10, 41]}})
+    in_space, _ = RICHAlignment._create_workspace(keywords, \
+{'distance': 0.1, 'angle': 1e-4, 'ref_index': 1e-4}, 'charge')
+    dofs = dict(zip(in_space['names'], in_space['dofs']))
+    assert dofs['frontal_mirror_b2_z'] == dofs['aerogel_b2_z']
+    assert len(set(in_space['dofs'])) == len(in_space['names']) - 1
+    assert dofs['charge'] == max(in_space['dofs'])
+
+def test_sgd_numeric_with_cache():
+    np.random.seed(0)
+    configs = {'MINIMA': {'type': 'sgd', 'momentum': 0.9, 'gradient': 'numeric', \
+'iters': 300, 'number_of_samples': 20, 'cache': True}}
+    model = QuadraticModel()
+    minimizer = Minimizer(model, configs)
+    min_point, _, _, _ = minimizer.find_minima(in_space)
+    assert np.allclose(minimizer.cache.steps.numpy(), 0.1*np.array(in_space['precisions']))
+    # Cache cells are not larger than the numeric step, so the start points move
+    assert np.all(np.abs(np.array(min_point) - model.center.numpy()) <= in_space['precisions'])
+    assert minimizer.cache.hits > 0
@@ -0,0 +1,69 @@
+import torch
+
+from src.models.nn_model import NNModel
+
+class FakeDataReader():
+    def __init__(self, num_of_points=200):
+        generator = torch.Generator().manual_seed(0)
+        self.x = torch.rand((num_of_points, 2), generator=generator)*2 - 1
+        self.y = (self.x**2).sum(axis=1, keepdim=True)
+        self.batch_size = None
+        self.num_of_batches = None
+
+    def get_data(self, batch_size=16, val_size=0.2, norm=True, shuffle=True):
+        n_val = int(len(self.x)*val_size)
+        self.batch_size = batch_size
+        n_train = len(self.x) - n_val
+        self.num_of_batches = n_train//batch_size + (0 if n_train%batch_size == 0 else 1)
+        return self.x[n_val:], self.x[:n_val], self.y[n_val:], self.y[:n_val]
+
+model_configs = {'input_layer': 2, 'output_layer': 1, 'hidden_layer_neurons': [16, 16]}
+
+train_info = {
+    'epochs': 200,
+    'optimizer': {'lr': 1e-2, 'momentum': 0.9},
+    'val_size': 0.2,
+    'batch_size': 16,
+    'shuffle': True,
+    'val_interval': 50
+}
+
+def test_mini_batch_training():
+    torch.manual_seed(0)
+    model = NNModel(model_configs)
+    model.train(FakeDataReader(), dict(train_info, batch_mode='mini'))
+    assert model.loss_hist['epochs'] == [50, 100, 150, 200]
+    assert model.loss_hist['val_loss'][-1] < 0.05
+
+def test_full_batch_training():
+    torch.manual_seed(0)
+    model = NNModel(model_configs)
+    # Full batch is the default
+    model.train(FakeDataReader(), train_info)
+    assert model.loss_hist['epochs'] == [50, 100, 150, 200]
+
+def test_early_stopping():
+    torch.manual_seed(0)
+    model = NNModel(model_configs)
+    early_stopping = {'patience': 2, 'min_delta': 1e3}
+    model.train(FakeDataReader(), dict(train_info, early_stopping=early_stopping, val_interval=10))
+    assert model.loss_hist['epochs'] == [10, 20, 30]
+
+def test_schedulers():
+    for scheduler in ({'type': 'plateau', 'factor': 0.5, 'patience': 1}, {'type': 'cosine'}):
+        torch.manual_seed(0)
+        model = NNModel(model_configs)
+        model.train(FakeDataReader(), dict(train_info, scheduler=scheduler))
+        assert model.loss_hist['val_loss'][-1] < 0.05
+
+def test_best_state_restored():
+    torch.manual_seed(0)
+    model = NNModel(model_configs)
+    reader = FakeDataReader()
+    model.train(reader, train_info)
+    _, x_val, _, y_val = reader.get_data(val_size=train_info['val_size'])
+    x_val = (x_val - model.norm_params['x_mean'])/(model.norm_params['x_std']+1e-5)
+    y_val = (y_val - model.norm_params['y_mean'])/(model.norm_params['y_std']+1e-5)
+    with torch.no_grad():
+        val_loss = float(torch.nn.functional.mse_loss(model.model(x_val), y_val))
+    assert abs(val_loss - min(model.loss_hist['val_loss'])) < 1e-6
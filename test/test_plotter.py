@@ -0,0 +1,182 @@
+import json
+import sys
+
+import numpy as np
+import pytest
+import ROOT
+import torch
+
+from src.plotter import Plotter
+
+class LinearModel():
+    '''
+    Two outputs with known values on every grid node
+    '''
+    def __init__(self):
+        self.calls = 0
+
+    def predict(self, x, grad=False):
+        self.calls += 1
+        with torch.set_grad_enabled(grad):
+            return torch.stack((x[:, 0] + 10*x[:, 1], x[:, 2]**2), dim=1)
+
+in_space = {
+    'space': [[-1, 1, 5], [0, 2, 3], [-2, 2, 9], [0, 1, 1]],
+    'names': ['aerogel_b2_z', 'aerogel_b2_theta_x', 'aerogel_b2_theta_y', 'charge'],
+    'precisions': [0.1, 1e-4, 1e-4, 1]
+}
+out_space = {'names': ['dir_aerogel_b2_tile_2_chi2', 'dir_aerogel_b2_tile_3_chi2']}
+res = {
+    'min_point': [0.5, 1.0, 1.0, 0.0],
+    'stat_error': [0.1, 0.1, 0.1, 0.0],
+    'neg_error': [0.2, 0.2, 0.2, 0.0],
+    'pos_error': [0.2, 0.2, 0.2, 0.0]
+}
+
+def _plotter():
+    plotter = Plotter(LinearModel())
+    plotter.setup_prediction_plotter(in_space, out_space, res)
+    return plotter
+
+def test_predict_pairs():
+    plotter = _plotter()
+    combs = plotter.get_pairs()
+    assert combs == [(0, 1), (0, 2), (1, 2)]
+    grids = plotter.predict_pairs(combs, chunk_size=20)
+    # 15 + 45 + 27 stacked points in chunks of 20
+    assert plotter.model.calls == 5
+    axis1_bins, axis2_bins, Y = grids[1]
+    assert Y.shape == (5, 9, 2)
+    expected = axis1_bins[:, None] + 10*1.0 + 0*axis2_bins[None, :]
+    assert np.allclose(Y[:, :, 0], expected)
+    assert np.allclose(Y[:, :, 1], np.tile(axis2_bins**2, (5, 1)))
+
+def test_create_root_tree(tmp_path):
+    plotter = _plotter()
+    output_path = tmp_path / 'plots.root'
+    plotter.create_root_tree(output_path)
+    assert plotter.model.calls == 1
+
+    root_file = ROOT.TFile.Open(str(output_path))
+    canv = root_file.Get('total_aerogel_b2_z_aerogel_b2_theta_x')
+    hist = canv.GetPrimitive('total_aerogel_b2_z_aerogel_b2_theta_x')
+    assert hist.GetNbinsX() == 5 and hist.GetNbinsY() == 3
+    for ix, x in enumerate(np.linspace(-1, 1, 5)):
+        for iy, y in enumerate(np.linspace(0, 2, 3)):
+            assert abs(hist.GetBinContent(ix + 1, iy + 1) - (x + 10*y + 1.0)) < 1e-4
+            assert hist.FindBin(x, y) == hist.GetBin(ix + 1, iy + 1)
+    root_file.Close()
+
+def _canvas_names(path):
+    root_file = ROOT.TFile.Open(str(path))
+    names = sorted(key.GetName() for key in root_file.GetListOfKeys())
+    root_file.Close()
+    return names
+
+def test_channel_maps_parallel(tmp_path):
+    plotter = _plotter()
+    plotter.create_root_tree(tmp_path / 'serial.root', channels=True)
+    plotter.create_root_tree(tmp_path / 'parallel.root', channels=True, workers=2)
+
+    names = _canvas_names(tmp_path / 'serial.root')
+    # Two channels and total for each of three pairs
+    assert len(names) == 9
+    assert 'dir_aerogel_b2_tile_3_chi2_aerogel_b2_z_aerogel_b2_theta_y' in names
+    assert _canvas_names(tmp_path / 'parallel.root') == names
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['parallel.root', 'serial.root']
+
+    root_file = ROOT.TFile.Open(str(tmp_path / 'parallel.root'))
+    name = 'dir_aerogel_b2_tile_3_chi2_aerogel_b2_z_aerogel_b2_theta_y'
+    hist = root_file.Get(name).GetPrimitive(name)
+    assert abs(hist.GetBinContent(1, 9) - 4.0) < 1e-4
+    root_file.Close()
+
+def test_saved_maps(tmp_path, monkeypatch):
+    # Only the no-matplotlib fallback: arrays are saved, nothing is rendered
+    monkeypatch.setitem(sys.modules, 'matplotlib', None)
+    monkeypatch.delitem(sys.modules, 'src.plotter.matplotlib_backend', raising=False)
+    plotter = Plotter(LinearModel(), 'matplotlib')
+    plotter.setup_prediction_plotter(in_space, out_space, res)
+    assert plotter.create_maps(tmp_path) is None
+    assert (tmp_path / 'maps.npz').exists()
+    assert not (tmp_path / 'plots.pdf').exists()
+
+    with np.load(tmp_path / 'maps.npz') as arrays:
+        assert arrays['values_0'].shape == (5, 3, 2)
+        assert arrays['input_names'].tolist() == in_space['names']
+
+    replot = Plotter(None)
+    replot.render_saved_maps(tmp_path / 'maps.npz', tmp_path, channels=True)
+    assert len(_canvas_names(tmp_path / 'plots.root')) == 9
+    root_file = ROOT.TFile.Open(str(tmp_path / 'plots.root'))
+    name = 'total_aerogel_b2_z_aerogel_b2_theta_x'
+    hist = root_file.Get(name).GetPrimitive(name)
+    assert abs(hist.GetBinContent(5, 3) - (1 + 20 + 1.0)) < 1e-4
+    root_file.Close()
+
+class HashedModel(LinearModel):
+    def __init__(self):
+        super().__init__()
+        self.points = 0
+
+    def predict(self, x, grad=False):
+        self.points += len(x)
+        return super().predict(x, grad)
+
+    def weights_hash(self):
+        return 'linear'
+
+def test_grid_cache(tmp_path):
+    plotter = Plotter(HashedModel())
+    plotter.setup_prediction_plotter(in_space, out_space, res)
+    plotter.set_cache(tmp_path / 'cache')
+    combs = plotter.get_pairs()
+    grids = plotter.predict_pairs(combs)
+    assert plotter.model.points == 15 + 45 + 27
+
+    cached = plotter.predict_pairs(combs)
+    assert plotter.model.points == 15 + 45 + 27
+    for grid, cached_grid in zip(grids, cached):
+        assert np.array_equal(grid[2], cached_grid[2])
+
+    # Moving the third feature changes only the pair without it
+    moved = dict(res, min_point=[0.5, 1.0, 1.5, 0.0])
+    plotter.setup_prediction_plotter(in_space, out_space, moved)
+    moved_grids = plotter.predict_pairs(combs)
+    assert plotter.model.points == 15 + 45 + 27 + 15
+    assert np.allclose(moved_grids[0][2][:, :, 1], 1.5**2)
+
+def test_profiles(tmp_path):
+    plotter = _plotter()
+    features, profiles = plotter.predict_profiles()
+    assert features == [0, 1, 2]
+    assert plotter.model.calls == 1
+    axis_bins, Y = profiles[2]
+    assert Y.shape == (9, 2)
+    assert np.allclose(Y[:, 1], axis_bins**2)
+
+    plotter.create_profiles(tmp_path)
+    with np.load(tmp_path / 'profiles.npz') as arrays:
+        assert arrays['values_0'].shape == (5, 2)
+    root_file = ROOT.TFile.Open(str(tmp_path / 'profiles.root'))
+    graph = root_file.Get('profile_aerogel_b2_theta_y')
+    assert graph.GetN() == 9
+    assert abs(graph.GetPointY(0) - (0.5 + 10 + 4)) < 1e-4
+    assert root_file.Get('profile_aerogel_b2_theta_y_min').GetN() == 1
+    root_file.Close()
+
+def test_matplotlib_backend(tmp_path):
+    pytest.importorskip('matplotlib')
+    plotter = Plotter(LinearModel(), 'matplotlib')
+    plotter.setup_prediction_plotter(in_space, out_space, res)
+    plotter.create_maps(tmp_path, channels=True)
+    plotter.create_profiles(tmp_path)
+
+    with open(tmp_path / 'loss.json', 'w', encoding='utf8') as file_handler:
+        json.dump({'epochs': [1, 2, 3], 'train_loss': [1.0, 0.5, 0.2], 'val_loss': [1.2, 0.6, 0.3]}, \
+file_handler)
+    plotter.draw_losses(tmp_path, 'loss.json')
+    plotter._get_backend().draw_diff(tmp_path / 'diff.pdf', np.array([0.1, -0.2]), np.array([0.01, 0.02]))
+
+    for name in ('plots.pdf', 'profiles.pdf', 'loss.pdf', 'diff.pdf'):
+        assert (tmp_path / name).stat().st_size > 0
@@ -0,0 +1,49 @@
+import torch
+
+from src.models import PredictCache
+
+class CountingModel():
+    def __init__(self):
+        self.points = 0
+
+    def predict(self, x, grad=False):
+        self.points += x.reshape((-1, x.shape[-1])).shape[0]
+        with torch.set_grad_enabled(grad):
+            return torch.stack((x.sum(axis=-1), (x**2).sum(axis=-1)), dim=-1)
+
+def test_cache_hits_and_misses():
+    model = CountingModel()
+    cache = PredictCache(model, [0.1, 0.01])
+    x = torch.tensor([[1.0, 0.5], [1.02, 0.502], [2.0, 0.1]])
+    y = cache.predict(x)
+    assert y.shape == (3, 2)
+    # First two points are in the same precision cell
+    assert torch.equal(y[0], y[1])
+    assert model.points == 2
+    assert cache.info() == {'hits': 1, 'misses': 2, 'size': 2}
+
+    y_again = cache.predict(x[[2, 0]])
+    assert torch.equal(y_again, y[[2, 0]])
+    assert model.points == 2
+    assert cache.hits == 3
+
+def test_cache_eviction_and_grad():
+    model = CountingModel()
+    cache = PredictCache(model, [0.1, 0.1], max_size=2)
+    for value in range(5):
+        cache.predict(torch.tensor([[float(value), 0.0]]))
+    assert len(cache.cache) == 2
+    cache.predict(torch.tensor([[0.0, 0.0]]))
+    assert model.points == 6
+
+    x = torch.tensor([[1.0, 2.0]], requires_grad=True)
+    y = cache.predict(x, grad=True).sum()
+    y.backward()
+    assert x.grad is not None
+    assert len(cache.cache) == 2
+
+def test_cache_empty_batch():
+    cache = PredictCache(CountingModel(), [0.1, 0.1])
+    y = cache.predict(torch.zeros((0, 2)))
+    assert y.shape == (0, 2)
+    assert cache.info() == {'hits': 0, 'misses': 0, 'size': 0}
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from src.data_handler.samplers import Sampler
+
+grids = [[-10, 10, 5], [-0.02, 0.02, 3], [1.045, 1.055, 2]]
+
+def test_samplers_box():
+    for strategy in ('uniform', 'lhs', 'sobol'):
+        values = Sampler(grids, strategy, seed=1).sample(64)
+        assert values.shape == (64, 3)
+        for i, (low, high, _) in enumerate(grids):
+            assert values[:, i].min() >= low
+            assert values[:, i].max() <= high
+
+def test_samplers_seed():
+    for strategy in ('uniform', 'lhs', 'sobol'):
+        values1 = Sampler(grids, strategy, seed=7).sample(16)
+        values2 = Sampler(grids, strategy, seed=7).sample(16)
+        values3 = Sampler(grids, strategy, seed=8).sample(16)
+        assert np.array_equal(values1, values2)
+        assert not np.array_equal(values1, values3)
+
+def test_lhs_strata():
+    num_of_points = 50
+    values = Sampler(grids, 'lhs', seed=3).sample(num_of_points)
+    for i, (low, high, _) in enumerate(grids):
+        strata = np.floor((values[:, i] - low)/(high - low)*num_of_points)
+        assert sorted(strata.astype(int).tolist()) == list(range(num_of_points))
+
+def test_grid_sampler():
+    values = Sampler(grids, 'grid').sample(10)
+    assert values.shape == (5*3*2, 3)
+    assert len(np.unique(values, axis=0)) == 30
+    assert set(values[:, 0].tolist()) == {-10., -5., 0., 5., 10.}
+
+def test_grid_sampler_too_large():
+    sampler = Sampler([[-10, 10, 41]]*7, 'grid')
+    with pytest.raises(ValueError, match='194754273881'):
+        sampler.sample(100)
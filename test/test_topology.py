@@ -40,3 +40,14 @@ def test_topology_writer():
         topology_data = dp.create_file(Path('dir.out'), Path('dir.out'), {})
     except Exception as error:
         assert str(error) == 'Topology file creation method not implemented as it should be created during the simulation!'
+
+
+def test_topology_selected_keywords():
+    dp = DataParser()
+    data_path = Path('test') /'data'/'RichReco_FastMC.root_hist.root_hp_dir.out'
+    keywords = ['dir_aerogel_b3_tile_30_chi2', 'dir_aerogel_b1_tile_3_entries']
+    topology_data = dp.read_file(data_path, keywords)
+
+    assert len(topology_data) == 2
+    assert topology_data['dir_aerogel_b3_tile_30_chi2'] == 21.281
+    assert topology_data['dir_aerogel_b1_tile_3_entries'] == 100
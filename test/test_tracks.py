@@ -0,0 +1,32 @@
+from pathlib import Path
+
+from src.file_handler.data_parser import DataParser
+
+def test_tracks_reader():
+    dp = DataParser()
+    data_path = Path('test') /'data'/'RichReco_FastMC.root_hist.root_hm_Tracks.out'
+    tracks_data = dp.read_file(data_path)
+
+    assert tracks_data['track_pmt_0_nevents'] == 0.
+    assert tracks_data['track_pmt_454_nevents'] == 2.463
+    assert tracks_data['track_pmt_455_mean'] == 0.137
+    assert tracks_data['track_pmt_456_std_err'] == 1.093
+    assert 'track_pmt_456_chi2' not in tracks_data
+
+
+def test_tracks_selected_keywords():
+    dp = DataParser()
+    data_path = Path('test') /'data'/'RichReco_FastMC.root_hist.root_hm_Tracks.out'
+    keywords = ['track_pmt_457_mean_err', 'track_pmt_454_nevents', 'track_pmt_458_std']
+    tracks_data = dp.read_file(data_path, keywords)
+
+    assert set(tracks_data) == set(keywords)
+    assert tracks_data['track_pmt_457_mean_err'] == 0.890
+    assert tracks_data['track_pmt_454_nevents'] == 2.463
+    assert tracks_data['track_pmt_458_std'] == 0.069
+
+    try:
+        dp.read_file(data_path, ['track_pmt_100000_mean'])
+        assert False
+    except KeyError:
+        pass